@@ -1,6 +1,8 @@
 from random import randint
+import numpy as np
 from lqer_cocotb import Testbench, lqer_runner
-from lqer_cocotb.utils import signal_uint
+from lqer_cocotb.utils import set_signal_limbs, signal_limbs, signal_uint
+from lqer_cocotb.wide import random_limbs
 import cocotb
 from cocotb import triggers as cc_triggers
 from cocotb.utils import get_sim_time
@@ -89,15 +91,15 @@ async def check_random_data_in(dut):
     await tb.reset()
     tb.log_sim_time("check_random_data_in reset")
     await cc_triggers.FallingEdge(dut.clk)
-    data_in = tb.generate_inputs(random=True)
-    dut.data_in.value = data_in
+    # DATA_WIDTH goes up to 256 bits, generate and check the words as uint64 limbs
+    data_in = random_limbs(tb.rng, NUM_ITERATIONS + 1, tb.DATA_WIDTH)
+    set_signal_limbs(dut.data_in, data_in[0])
     for i in range(NUM_ITERATIONS):
         await cc_triggers.FallingEdge(dut.clk)
-        assert signal_uint(dut.data_out) == tb.model(
-            data_in
+        assert np.array_equal(
+            signal_limbs(dut.data_out), tb.model(data_in[i])
         ), f"random check failed at {get_sim_time('ns')}"
-        data_in = tb.generate_inputs(random=True)
-        dut.data_in.value = data_in
+        set_signal_limbs(dut.data_in, data_in[i + 1])
 
 
 def generate_random_module_params():
@@ -3,7 +3,7 @@ import cocotb
 from cocotb import triggers as cc_triggers
 from cocotb.utils import get_sim_time
 from lqer_cocotb import Testbench, lqer_runner
-from lqer_cocotb.interface import StreamDriver, StreamMonitor, bit_driver
+from lqer_cocotb.interface import Schedule, StreamDriver, StreamMonitor, bit_driver
 from lqer_cocotb.utils import signal_int, signal_uint
 
 
@@ -21,7 +21,7 @@ class SkidBufferTB(Testbench):
 
         if enable_driver:
             self.input_driver = StreamDriver(
-                dut.clk, dut.data_in, dut.valid_in, dut.ready_in
+                dut.clk, dut.data_in, dut.valid_in, dut.ready_in, stall_limit=1000
             )
             self.output_monitor = StreamMonitor(
                 dut.clk,
@@ -29,7 +29,10 @@ class SkidBufferTB(Testbench):
                 dut.valid_out,
                 dut.ready_out,
                 check_fmt="unsigned_integer",
+                stall_limit=1000,
             )
+            self.input_drivers.append(self.input_driver)
+            self.output_monitors.append(self.output_monitor)
 
     def generate_inputs(self, random: bool):
         if not random:
@@ -160,8 +163,8 @@ async def check_data_path_no_back_pressure(dut):
         tb.input_driver.append(data_in)
         tb.output_monitor.expect(expect_out)
 
-    await cc_triggers.Timer(NUM_TRANSACTIONS * 1e6, units="step")
-    assert tb.output_monitor.exp_queue.empty()
+    await tb.wait_done(timeout=NUM_TRANSACTIONS * 1e6, units="step")
+    assert len(tb.output_monitor.exp_queue) == 0
 
 
 @cocotb.test()
@@ -208,8 +211,28 @@ async def check_data_path_back_pressure_no_CBM(dut):
         expect_out = tb.model(data_in)
         tb.input_driver.append(data_in)
         tb.output_monitor.expect(expect_out)
-    await cc_triggers.Timer(NUM_ITERATIONS * 1e6, units="step")
-    assert tb.output_monitor.exp_queue.empty()
+    await tb.wait_done(timeout=NUM_ITERATIONS * 1e6, units="step")
+    assert len(tb.output_monitor.exp_queue) == 0
+
+
+@cocotb.test()
+async def check_data_path_bursty_back_pressure_no_CBM(dut):
+    NUM_ITERATIONS = 100
+    if dut.CIRCULAR_BUFFER_MODE == 1:
+        return
+    tb = SkidBufferTB(dut, enable_driver=True)
+    tb.output_monitor.set_ready_schedule(Schedule.markov(p_on_to_off=0.2, p_off_to_on=0.3))
+    tb.input_driver.set_valid_schedule(Schedule.burst(max_on=8, max_off=4))
+    await tb.reset()
+    tb.log_sim_time("check_data_path_bursty_back_pressure_no_CBM reset")
+
+    for _ in range(NUM_ITERATIONS):
+        data_in = tb.generate_inputs(random=True)
+        expect_out = tb.model(data_in)
+        tb.input_driver.append(data_in)
+        tb.output_monitor.expect(expect_out)
+    await tb.wait_done(timeout=NUM_ITERATIONS * 1e6, units="step")
+    assert len(tb.output_monitor.exp_queue) == 0
 
 
 def pytest_skid_buffer():
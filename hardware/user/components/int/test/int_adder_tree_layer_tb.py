@@ -6,7 +6,9 @@ from cocotb import triggers as cc_triggers
 from cocotb.utils import get_sim_time
 
 from lqer_cocotb import Testbench, lqer_runner
-from lqer_cocotb.utils import array1d_int, array1d_uint
+from lqer_cocotb.models import adder_tree_layer, adder_tree_layer_trace, adder_tree_node_latency
+from lqer_cocotb.utils import array1d_int, array1d_uint, signal_uint
+from lqer_cocotb.packed import packed_array
 from lqer_cocotb.quantize import quantize_to_fixed_point
 
 
@@ -47,14 +49,20 @@ class IntAdderTreeLayerTB(Testbench):
         return words_in
 
     def model(self, words_in: list[int]) -> int:
-        words_out = []
-        for pair_id in range(self.dut.NumInPairs.value):
-            words_out.append(words_in[2 * pair_id] + words_in[2 * pair_id + 1])
-
-        if self.dut.NumInOdd.value:
-            words_out.append(words_in[-1])
-
-        return words_out
+        words_out, _ = adder_tree_layer([words_in], self.BITS_PER_IN_WORD, self.BITS_PER_OUT_WORD, bool(self.SIGN_EXT))
+        return words_out[0].tolist()
+
+    def model_trace(self, words_in: list[list[int]], extra_bits_in: list[int]):
+        words_out, extra_bits_out = adder_tree_layer_trace(
+            words_in,
+            self.BITS_PER_IN_WORD,
+            self.BITS_PER_OUT_WORD,
+            bool(self.SIGN_EXT),
+            self.REGISTER_MIDDLE,
+            self.REGISTER_OUTPUT,
+            extra_bits_in if self.EXTRA_BIT_CONNECTED else None,
+        )
+        return words_out.tolist(), extra_bits_out.tolist()
 
 
 def check_msg(msg: str):
@@ -68,7 +76,7 @@ async def check_determined_inputs(dut):
     inputs = tb.generate_inputs(random=False)
     exp_out = tb.model(inputs)
 
-    dut.words_in.value = inputs
+    packed_array(dut.words_in).write(inputs)
     await cc_triggers.Timer(1, "us")
 
     array1d2int = array1d_int if tb.SIGN_EXT else array1d_uint
@@ -82,13 +90,39 @@ async def check_random_inputs(dut):
     inputs = tb.generate_inputs(random=True)
     exp_out = tb.model(inputs)
 
-    dut.words_in.value = inputs
+    packed_array(dut.words_in).write(inputs)
     await cc_triggers.Timer(1, "us")
 
     array1d2int = array1d_int if tb.SIGN_EXT else array1d_uint
     assert array1d2int(dut.words_out) == exp_out, check_msg("check_random_inputs")
 
 
+@cocotb.test()
+async def check_random_inputs_trace(dut):
+    NUM_RANDOM_INPUTS = 100
+    tb = IntAdderTreeLayerTB(dut)
+    array1d2int = array1d_int if tb.SIGN_EXT else array1d_uint
+    await tb.reset()
+
+    # the outputs in every cycle after reset, including the reset values before the first input arrives
+    num_cycles = NUM_RANDOM_INPUTS + adder_tree_node_latency(tb.REGISTER_MIDDLE, tb.REGISTER_OUTPUT)
+    words_in = [tb.generate_inputs(random=True) for _ in range(num_cycles)]
+    extra_bits_in = [randint(0, 1) for _ in range(num_cycles)]
+    exp_words_out, exp_extra_bits_out = tb.model_trace(words_in, extra_bits_in)
+
+    words_out, extra_bits_out = [], []
+    for inputs, extra_bit_in in zip(words_in, extra_bits_in):
+        packed_array(dut.words_in).write(inputs)
+        dut.extra_bit_in.value = extra_bit_in
+        await cc_triggers.ReadOnly()
+        words_out.append(array1d2int(dut.words_out))
+        extra_bits_out.append(signal_uint(dut.extra_bit_out))
+        await cc_triggers.FallingEdge(dut.clk)
+
+    assert words_out == exp_words_out, check_msg("check_random_inputs_trace")
+    assert extra_bits_out == exp_extra_bits_out, check_msg("check_random_inputs_trace")
+
+
 def generate_random_params(sign_ext: bool):
     params = {
         "NUM_IN_WORDS": randint(1, 16),
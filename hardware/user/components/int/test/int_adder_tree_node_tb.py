@@ -5,7 +5,8 @@ from cocotb import triggers as cc_triggers
 from cocotb.utils import get_sim_time
 
 from lqer_cocotb import Testbench, lqer_runner
-from lqer_cocotb.utils import signal_int, signal_uint, unsigned_extend
+from lqer_cocotb.models import adder_tree_node, adder_tree_node_latency, adder_tree_node_middle, adder_tree_node_trace
+from lqer_cocotb.utils import signal_int, signal_uint
 
 
 class IntAdderTreeNode(Testbench):
@@ -39,7 +40,13 @@ class IntAdderTreeNode(Testbench):
         return {"a": a, "b": b}
 
     def model(self, a: int, b: int) -> int:
-        return a + b
+        return int(adder_tree_node(a, b, self.IN_BITS, self.OUT_BITS, bool(self.SIGN_EXT)))
+
+    def model_trace(self, a: list[int], b: list[int]) -> list[int]:
+        out = adder_tree_node_trace(
+            a, b, self.IN_BITS, self.OUT_BITS, bool(self.SIGN_EXT), self.REGISTER_MIDDLE, self.REGISTER_OUTPUT
+        )
+        return out.tolist()
 
 
 def check_msg(msg: str):
@@ -90,10 +97,9 @@ async def check_pipeline_register_middle_values(dut):
     dut.a.value = inputs["a"]
     dut.b.value = inputs["b"]
     await cc_triggers.FallingEdge(dut.clk)
-    exp_ls_adder = unsigned_extend(inputs["a"], dut.LSWidth.value) + unsigned_extend(
-        inputs["b"], dut.LSWidth.value
+    exp_ls_adder, exp_cross_carry = adder_tree_node_middle(
+        inputs["a"], inputs["b"], tb.IN_BITS, tb.OUT_BITS, bool(tb.SIGN_EXT)
     )
-    exp_cross_carry = exp_ls_adder >> dut.LSWidth.value
     assert signal_uint(dut.gen_register_middle.ls_adder) == exp_ls_adder, check_msg(
         "check_pipeline_register_middle_values"
     )
@@ -141,6 +147,29 @@ async def check_pipeline_registers(dut):
         )
 
 
+@cocotb.test()
+async def check_random_inputs_trace(dut):
+    NUM_RANDOM_INPUTS = 100
+    tb = IntAdderTreeNode(dut)
+    signal2int = signal_int if tb.SIGN_EXT else signal_uint
+    await tb.reset()
+
+    # the output in every cycle after reset, including the reset values before the first input arrives
+    num_cycles = NUM_RANDOM_INPUTS + adder_tree_node_latency(tb.REGISTER_MIDDLE, tb.REGISTER_OUTPUT)
+    inputs = [tb.generate_inputs(random=True) for _ in range(num_cycles)]
+    exp_out = tb.model_trace([x["a"] for x in inputs], [x["b"] for x in inputs])
+
+    out = []
+    for x in inputs:
+        dut.a.value = x["a"]
+        dut.b.value = x["b"]
+        await cc_triggers.ReadOnly()
+        out.append(signal2int(dut.out))
+        await cc_triggers.FallingEdge(dut.clk)
+
+    assert out == exp_out, check_msg("check_random_inputs_trace")
+
+
 def generate_random_params(sign_ext: bool):
     params = {"IN_BITS": randint(2, 64) if sign_ext else randint(1, 64)}
     return params
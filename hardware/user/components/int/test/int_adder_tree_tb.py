@@ -1,5 +1,4 @@
 from random import randint
-from collections import deque
 import math
 
 from cocotb import cocotb
@@ -8,7 +7,8 @@ from cocotb.utils import get_sim_time
 import numpy as np
 
 from lqer_cocotb import Testbench, lqer_runner
-from lqer_cocotb.quantize import quantize_to_fixed_point
+from lqer_cocotb.models import adder_tree, adder_tree_latency, adder_tree_trace
+from lqer_cocotb.packed import packed_array
 from lqer_cocotb.utils import signal_int, signal_uint
 
 
@@ -33,25 +33,49 @@ class IntAdderTreeTB(Testbench):
             self.WORD_IN_MAX = 2**self.BITS_PER_IN_WORD - 1
             self.WORD_IN_MIN = 0
 
-    def generate_inputs(self, random: bool):
-        if random:
-            words_in = [randint(self.WORD_IN_MIN, self.WORD_IN_MAX) for _ in range(self.NUM_IN_WORDS)]
-            extra_bit_in = randint(0, 1) if self.EXTRA_BIT_USED else None
+    def generate_batch(self, num_beats: int, dist: str = "uniform"):
+        """
+        `num_beats` beats of inputs, (num_beats, NUM_IN_WORDS) words and (num_beats,) extra bits or None
+        """
+        words_in = self.generate_words(num_beats, self.NUM_IN_WORDS, self.BITS_PER_IN_WORD, dist=dist)
+        if not self.EXTRA_BIT_USED:
+            extra_bits_in = None
+        elif dist == "linspace":
+            extra_bits_in = np.ones(num_beats, dtype=np.int64)
         else:
-            words_in = np.linspace(self.WORD_IN_MIN, self.WORD_IN_MAX, self.NUM_IN_WORDS)
-            words_in = quantize_to_fixed_point(
-                words_in,
-                self.BITS_PER_IN_WORD,
-                frac_width=0,
-                is_signed=self.SIGN_EXT,
-                rounding="nearest",
-            ).tolist()
-            extra_bit_in = 1 if self.EXTRA_BIT_USED else None
-
-        return words_in, extra_bit_in
+            extra_bits_in = self.rng.integers(0, 1, size=num_beats, endpoint=True)
+        return words_in, extra_bits_in
+
+    def generate_inputs(self, random: bool):
+        words_in, extra_bits_in = self.generate_batch(1, dist="uniform" if random else "linspace")
+        extra_bit_in = None if extra_bits_in is None else int(extra_bits_in[0])
+        return words_in[0].tolist(), extra_bit_in
+
+    def model_batch(self, words_in, extra_bits_in=None):
+        """
+        (batch,) sums and extra bits of (batch, NUM_IN_WORDS) `words_in`
+        """
+        extra_bits_in = extra_bits_in if self.EXTRA_BIT_USED else None
+        return adder_tree(words_in, self.BITS_PER_IN_WORD, self.OUT_BITS, bool(self.SIGN_EXT), extra_bits_in)
+
+    def model_trace(self, words_in, extra_bits_in=None):
+        """
+        (num_cycles,) outputs and extra bits in each cycle after reset, for the (num_cycles, NUM_IN_WORDS) inputs
+        """
+        extra_bits_in = extra_bits_in if self.EXTRA_BIT_USED else None
+        return adder_tree_trace(
+            words_in,
+            self.BITS_PER_IN_WORD,
+            self.OUT_BITS,
+            bool(self.SIGN_EXT),
+            self.REGISTER_MIDDLE,
+            self.REGISTER_OUTPUT,
+            extra_bits_in,
+        )
 
     def model(self, words_in: list[int], extra_bit_in=None) -> int:
-        return sum(words_in), extra_bit_in
+        out, extra_bit_out = self.model_batch([words_in], extra_bit_in)
+        return int(out[0]), int(extra_bit_out[0]) if self.EXTRA_BIT_USED else None
 
 
 def check_msg(msg: str):
@@ -67,7 +91,7 @@ async def check_determined_inputs_no_pipeline_reg(dut):
         return
 
     words_in, extra_bit_in = tb.generate_inputs(random=False)
-    dut.words_in.value = words_in
+    packed_array(dut.words_in).write(words_in)
     if tb.EXTRA_BIT_USED:
         dut.extra_bit_in.value = extra_bit_in
     await cc_triggers.FallingEdge(dut.clk)
@@ -85,16 +109,18 @@ async def check_random_inputs_no_pipeline_reg(dut):
     await tb.reset()
     if tb.REGISTER_MIDDLE or tb.REGISTER_OUTPUT:
         return
-    for _ in range(NUM_RANDOM_INPUTS):
-        words_in, extra_bit_in = tb.generate_inputs(random=True)
-        exp_out, exp_extra_bit = tb.model(words_in, extra_bit_in)
-        dut.words_in.value = words_in
+    batch_words_in, batch_extra_bits_in = tb.generate_batch(NUM_RANDOM_INPUTS, dist="corner")
+    batch_exp_out, batch_exp_extra_bits = tb.model_batch(batch_words_in, batch_extra_bits_in)
+    for i in range(NUM_RANDOM_INPUTS):
+        packed_array(dut.words_in).write(batch_words_in[i])
         if tb.EXTRA_BIT_USED:
-            dut.extra_bit_in.value = extra_bit_in
+            dut.extra_bit_in.value = int(batch_extra_bits_in[i])
         await cc_triggers.FallingEdge(dut.clk)
-        assert signal2int(dut.out) == exp_out, check_msg("check_random_inputs_no_pipeline_reg")
+        assert signal2int(dut.out) == batch_exp_out[i], check_msg("check_random_inputs_no_pipeline_reg")
         if tb.EXTRA_BIT_USED:
-            assert signal_uint(dut.extra_bit_out) == exp_extra_bit, check_msg("check_random_inputs_no_pipeline_reg")
+            assert signal_uint(dut.extra_bit_out) == batch_exp_extra_bits[i], check_msg(
+                "check_random_inputs_no_pipeline_reg"
+            )
 
 
 @cocotb.test()
@@ -102,37 +128,30 @@ async def check_random_inputs_pipeline_reg(dut):
     NUM_RANDOM_INPUTS = 100
     tb = IntAdderTreeTB(dut)
     signal2int = signal_int if tb.SIGN_EXT else signal_uint
-    out_queue = deque()
-    exp_out_queue = deque()
-    extra_bit_queue = deque()
-    exp_extra_bit_queue = deque()
     await tb.reset()
 
-    num_layers = dut.NumLayers.value
-    num_prefill_cycles = (dut.REGISTER_MIDDLE.value + dut.REGISTER_OUTPUT.value) * num_layers
+    # run until the last random input reaches the output, the trace starts with the reset values
+    num_cycles = NUM_RANDOM_INPUTS + adder_tree_latency(tb.NUM_IN_WORDS, tb.REGISTER_MIDDLE, tb.REGISTER_OUTPUT)
+    batch_words_in, batch_extra_bits_in = tb.generate_batch(num_cycles)
+    exp_out, exp_extra_bits = tb.model_trace(batch_words_in, batch_extra_bits_in)
 
-    for i in range(NUM_RANDOM_INPUTS + num_prefill_cycles):
+    out = np.zeros(num_cycles, dtype=np.int64)
+    extra_bits = np.zeros(num_cycles, dtype=np.int64)
+    for i in range(num_cycles):
+        packed_array(dut.words_in).write(batch_words_in[i])
+        if tb.EXTRA_BIT_USED:
+            dut.extra_bit_in.value = int(batch_extra_bits_in[i])
+        await cc_triggers.ReadOnly()
+        out[i] = signal2int(dut.out)
+        extra_bits[i] = signal_uint(dut.extra_bit_out)
         await cc_triggers.FallingEdge(dut.clk)
-        if i < NUM_RANDOM_INPUTS:
-            words_in, extra_bit_in = tb.generate_inputs(random=True)
-            exp_out, exp_extra_bit_out = tb.model(words_in, extra_bit_in)
-            exp_out_queue.append(exp_out)
-            if tb.EXTRA_BIT_USED:
-                exp_extra_bit_queue.append(exp_extra_bit_out)
-            dut.words_in.value = words_in
-            if tb.EXTRA_BIT_USED:
-                dut.extra_bit_in.value = extra_bit_in
-
-        if i >= num_prefill_cycles:
-            await cc_triggers.ReadOnly()
-            out = signal2int(dut.out)
-            out_queue.append(out)
-            if dut.EXTRA_BIT_USED.value:
-                extra_bit_queue.append(signal_uint(dut.extra_bit_out))
-
-    assert out_queue == exp_out_queue, check_msg("check_random_inputs_pipeline_reg")
-    if dut.EXTRA_BIT_USED.value:
-        assert extra_bit_queue == exp_extra_bit_queue, check_msg("check_random_inputs_pipeline_reg")
+
+    assert np.array_equal(out, exp_out), check_msg(
+        f"check_random_inputs_pipeline_reg: first mismatch at cycle {np.argmax(out != exp_out)}"
+    )
+    assert np.array_equal(extra_bits, exp_extra_bits), check_msg(
+        f"check_random_inputs_pipeline_reg: first extra bit mismatch at cycle {np.argmax(extra_bits != exp_extra_bits)}"
+    )
 
 
 def generate_random_params(is_signed: bool):
@@ -1,25 +1,34 @@
 from random import randint
+from time import perf_counter
 
 from cocotb import cocotb
 from cocotb import triggers as cc_triggers
 from cocotb.utils import get_sim_time
-import numpy as np
 
 from lqer_cocotb import Testbench, lqer_runner
-from lqer_cocotb.interface import StreamDriver, StreamMonitor, bit_driver
-from lqer_cocotb.quantize import quantize_to_fixed_point
+from lqer_cocotb.models import entrywise_product
+from lqer_cocotb.testbench import CLOCK_PERIOD_NS
+from lqer_cocotb.interface import Schedule, Scoreboard, StreamDriver, StreamMonitor, bit_driver
 
 
 class IntEntrywiseProductTB(Testbench):
-    def __init__(self, dut) -> None:
-        super().__init__(dut, dut.clk, dut.rst)
+    def __init__(self, dut, engine: bool = False) -> None:
+        super().__init__(dut, dut.clk, dut.rst, engine=engine)
 
         self.assign_self_params("A_WIDTH", "B_WIDTH", "A_DIM_0_B_DIM_0")
-        self.data_in_a_driver = StreamDriver(dut.clk, dut.data_in_a, dut.valid_in_a, dut.ready_in_a)
-        self.data_in_b_driver = StreamDriver(dut.clk, dut.data_in_b, dut.valid_in_b, dut.ready_in_b)
+        self.data_in_a_driver = StreamDriver(dut.clk, dut.data_in_a, dut.valid_in_a, dut.ready_in_a, stall_limit=1000)
+        self.data_in_b_driver = StreamDriver(dut.clk, dut.data_in_b, dut.valid_in_b, dut.ready_in_b, stall_limit=1000)
         self.data_out_monitor = StreamMonitor(
-            dut.clk, dut.data_out, dut.valid_out, dut.ready_out, check_fmt="signed_integer"
+            dut.clk,
+            dut.data_out,
+            dut.valid_out,
+            dut.ready_out,
+            check_fmt="signed_integer",
+            stall_limit=1000,
+            scoreboard=Scoreboard(chunk_size=64, fail_fast=True),
         )
+        self.input_drivers += [self.data_in_a_driver, self.data_in_b_driver]
+        self.output_monitors.append(self.data_out_monitor)
 
         self.DATA_IN_A_MAX = 2 ** (self.A_WIDTH - 1) - 1
         self.DATA_IN_A_MIN = -(2 ** (self.A_WIDTH - 1))
@@ -27,22 +36,21 @@ class IntEntrywiseProductTB(Testbench):
         self.DATA_IN_B_MAX = 2 ** (self.B_WIDTH - 1) - 1
         self.DATA_IN_B_MIN = -(2 ** (self.B_WIDTH - 1))
 
-    def generate_inputs(self, random: bool):
-        if random:
-            a = [randint(self.DATA_IN_A_MIN, self.DATA_IN_A_MAX) for _ in range(self.A_DIM_0_B_DIM_0)]
-            b = [randint(self.DATA_IN_B_MIN, self.DATA_IN_B_MAX) for _ in range(self.A_DIM_0_B_DIM_0)]
-        else:
-            a = np.linspace(self.DATA_IN_A_MIN, self.DATA_IN_A_MAX, self.A_DIM_0_B_DIM_0)
-            b = np.linspace(self.DATA_IN_B_MIN, self.DATA_IN_B_MAX, self.A_DIM_0_B_DIM_0)
-            a = quantize_to_fixed_point(a, self.A_WIDTH, frac_width=0, is_signed=True, rounding="nearest").tolist()
-            b = quantize_to_fixed_point(b, self.B_WIDTH, frac_width=0, is_signed=True, rounding="nearest").tolist()
+    def generate_batch(self, num_beats: int, dist: str = "uniform"):
+        """
+        `num_beats` beats of inputs, (num_beats, A_DIM_0_B_DIM_0) arrays
+        """
+        a = self.generate_words(num_beats, self.A_DIM_0_B_DIM_0, self.A_WIDTH, signed=True, dist=dist)
+        b = self.generate_words(num_beats, self.A_DIM_0_B_DIM_0, self.B_WIDTH, signed=True, dist=dist)
         return {"data_in_a": a, "data_in_b": b}
 
+    def generate_inputs(self, random: bool):
+        inputs = self.generate_batch(1, dist="uniform" if random else "linspace")
+        return {name: words[0].tolist() for name, words in inputs.items()}
+
     def model(self, data_in_a, data_in_b):
-        # ensure data_in_a/b is a list of integers
-        # ensure len(data_in_a) == len(data_in_b)
-        out = [a * b for a, b in zip(data_in_a, data_in_b)]
-        return out
+        # a beat or a (batch, A_DIM_0_B_DIM_0) batch of beats
+        return entrywise_product(data_in_a, data_in_b, self.A_WIDTH, self.B_WIDTH)
 
 
 def check_msg(msg: str):
@@ -64,8 +72,8 @@ async def check_determined_inputs_no_back_pressure(dut):
     exp_out = tb.model(**inputs)
     tb.data_out_monitor.expect(exp_out)
 
-    await cc_triggers.Timer(NUM_ITERATIONS * 1e6, "step")
-    assert tb.data_out_monitor.exp_queue.empty(), check_msg("check_determined_inputs_no_back_pressure")
+    await tb.wait_done(timeout=NUM_ITERATIONS * 1e6, units="step")
+    assert len(tb.data_out_monitor.exp_queue) == 0, check_msg("check_determined_inputs_no_back_pressure")
 
 
 @cocotb.test()
@@ -77,16 +85,13 @@ async def check_random_inputs_no_back_pressure(dut):
     tb.data_in_b_driver.set_valid_prob(1.0)
     tb.data_out_monitor.ready.value = 1
 
-    for _ in range(NUM_ITERATIONS):
-        inputs = tb.generate_inputs(random=True)
-        tb.data_in_a_driver.append(inputs["data_in_a"])
-        tb.data_in_b_driver.append(inputs["data_in_b"])
+    inputs = tb.generate_batch(NUM_ITERATIONS)
+    tb.data_in_a_driver.load_driver(inputs["data_in_a"])
+    tb.data_in_b_driver.load_driver(inputs["data_in_b"])
+    tb.data_out_monitor.load_monitor(tb.model(**inputs))
 
-        exp_out = tb.model(**inputs)
-        tb.data_out_monitor.expect(exp_out)
-
-    await cc_triggers.Timer(NUM_ITERATIONS * 1e6, "step")
-    assert tb.data_out_monitor.exp_queue.empty(), check_msg("check_random_inputs_no_back_pressure")
+    await tb.wait_done(timeout=NUM_ITERATIONS * 1e6, units="step")
+    assert len(tb.data_out_monitor.exp_queue) == 0, check_msg("check_random_inputs_no_back_pressure")
 
 
 @cocotb.test()
@@ -105,28 +110,39 @@ async def check_determined_inputs_with_back_pressure(dut):
         exp_out = tb.model(**inputs)
         tb.data_out_monitor.expect(exp_out)
 
-    await cc_triggers.Timer(NUM_ITERATIONS * 1e6, "step")
-    assert tb.data_out_monitor.exp_queue.empty(), check_msg("check_determined_inputs_with_back_pressure")
+    await tb.wait_done(timeout=NUM_ITERATIONS * 1e6, units="step")
+    assert len(tb.data_out_monitor.exp_queue) == 0, check_msg("check_determined_inputs_with_back_pressure")
 
 
-@cocotb.test()
-async def check_random_inputs_with_back_pressure(dut):
+async def random_inputs_with_back_pressure(dut, engine: bool):
     NUM_ITERATIONS = 100
-    tb = IntEntrywiseProductTB(dut)
+    tb = IntEntrywiseProductTB(dut, engine=engine)
     tb.data_in_a_driver.set_valid_prob(0.8)
     tb.data_in_b_driver.set_valid_prob(0.8)
-    cocotb.start_soon(bit_driver(tb.data_out_monitor.ready, clk=dut.clk, prob=0.5))
+    tb.data_out_monitor.set_ready_schedule(Schedule.bernoulli(0.5))
 
-    for _ in range(NUM_ITERATIONS):
-        inputs = tb.generate_inputs(random=True)
-        tb.data_in_a_driver.append(inputs["data_in_a"])
-        tb.data_in_b_driver.append(inputs["data_in_b"])
+    inputs = tb.generate_batch(NUM_ITERATIONS, dist="corner")
+    tb.data_in_a_driver.load_driver(inputs["data_in_a"])
+    tb.data_in_b_driver.load_driver(inputs["data_in_b"])
+    tb.data_out_monitor.load_monitor(tb.model(**inputs))
 
-        exp_out = tb.model(**inputs)
-        tb.data_out_monitor.expect(exp_out)
+    start_ns, start_s = get_sim_time("ns"), perf_counter()
+    await tb.wait_done(timeout=NUM_ITERATIONS * 1e6, units="step")
+    assert len(tb.data_out_monitor.exp_queue) == 0, check_msg("check_random_inputs_with_back_pressure")
+
+    # wall-clock cost per simulated cycle, to compare the engine with a coroutine per interface
+    num_cycles = (get_sim_time("ns") - start_ns) / CLOCK_PERIOD_NS
+    tb.log_sim_time(f"engine={engine}: {(perf_counter() - start_s) / num_cycles * 1e6:.1f} us/cycle")
 
-    await cc_triggers.Timer(NUM_ITERATIONS * 1e6, "step")
-    assert tb.data_out_monitor.exp_queue.empty(), check_msg("check_random_inputs_with_back_pressure")
+
+@cocotb.test()
+async def check_random_inputs_with_back_pressure(dut):
+    await random_inputs_with_back_pressure(dut, engine=False)
+
+
+@cocotb.test()
+async def check_random_inputs_with_back_pressure_engine(dut):
+    await random_inputs_with_back_pressure(dut, engine=True)
 
 
 def generate_random_module_params():
@@ -7,6 +7,7 @@ from cocotb.utils import get_sim_time
 
 from lqer_cocotb.testbench import Testbench
 from lqer_cocotb.runner import lqer_runner
+from lqer_cocotb.models import multiply
 from lqer_cocotb.utils import signal_int
 
 logger = logging.getLogger(f"lqer_cocotb.{__name__}")
@@ -33,7 +34,7 @@ class IntMultiplyTB(Testbench):
         return a, b
 
     def model(self, a, b):
-        return a * b
+        return int(multiply(a, b, self.A_WIDTH, self.B_WIDTH))
 
 
 def check_msg(msg: str) -> str:
@@ -0,0 +1,329 @@
+"""
+Micro-benchmarks of the Python overhead of lqer_cocotb, run with `python -m lqer_cocotb.benchmark <benchmark>`
+"""
+
+import argparse
+import random
+import timeit
+import tracemalloc
+from collections import deque
+from queue import Queue
+
+import numpy as np
+
+from .interface.beats import BeatQueue
+from .interface.schedule import Schedule
+from .interface.scoreboard import Scoreboard
+from . import wide
+from .packed import decode_binstr, encode_binstr
+from .quantize import fixed_point_matmul, quantize_to_fixed_point
+
+
+def _queue_beats(num_beats: int) -> None:
+    # per-beat bookkeeping of Driver and Monitor with queue.Queue and the recv_queue round-trip
+    send_queue, recv_queue, exp_queue = Queue(), Queue(), Queue()
+    for beat in range(num_beats):
+        send_queue.put(beat)
+        exp_queue.put(beat)
+    while not send_queue.empty():
+        tr = send_queue.get()
+        recv_queue.put(tr)
+        assert not exp_queue.empty()
+        assert recv_queue.get() == exp_queue.get()
+
+
+def _deque_beats(num_beats: int) -> None:
+    # per-beat bookkeeping of Driver and Monitor with deques
+    send_queue, exp_queue = deque(), deque()
+    for beat in range(num_beats):
+        send_queue.append(beat)
+        exp_queue.append(beat)
+    while send_queue:
+        tr = send_queue.popleft()
+        assert exp_queue
+        assert tr == exp_queue.popleft()
+
+
+def bench_queue(num_beats: int, repeat: int) -> dict[str, float]:
+    """
+    ns per beat spent in the queues of a driver-monitor pair
+    """
+    results = {}
+    for name, beats in [("queue.Queue", _queue_beats), ("deque", _deque_beats)]:
+        elapsed = min(timeit.repeat(lambda: beats(num_beats), number=1, repeat=repeat))
+        results[name] = elapsed / num_beats * 1e9
+    return results
+
+
+def bench_load(num_beats: int, num_elements: int) -> dict[str, tuple[float, float]]:
+    """
+    (ms, MB) to load a (num_beats, num_elements) int64 array into a driver queue beat by beat and in bulk
+    """
+    array = np.random.randint(-128, 128, size=(num_beats, num_elements), dtype=np.int64)
+
+    def per_beat():
+        queue = deque()
+        for beat in array:
+            queue.append(beat.tolist())
+        return queue
+
+    def bulk():
+        queue = BeatQueue()
+        queue.extend(array)
+        return queue
+
+    results = {}
+    for name, load in [("per-beat", per_beat), ("bulk", bulk)]:
+        tracemalloc.start()
+        start = timeit.default_timer()
+        queue = load()
+        elapsed = timeit.default_timer() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del queue
+        results[name] = (elapsed * 1e3, peak / 1024**2)
+    return results
+
+
+def bench_decode(length: int, width: int, repeat: int) -> dict[str, float]:
+    """
+    us to decode one beat of a `length` x `width`-bit signed array port per element and vectorised,
+    excluding the simulator reads
+    """
+    from cocotb.binary import BinaryRepresentation, BinaryValue
+
+    values = np.random.randint(0, 2**width, size=length, dtype=np.uint64).tolist()
+    binstrs = [format(v, f"0{width}b") for v in values]
+    binstr = "".join(binstrs)
+
+    def per_element():
+        return [
+            BinaryValue(b, n_bits=width, binaryRepresentation=BinaryRepresentation.TWOS_COMPLEMENT).signed_integer
+            for b in binstrs
+        ]
+
+    def vectorised():
+        return decode_binstr(binstr, width, signed=True)
+
+    assert per_element() == vectorised().tolist()
+    return {
+        name: min(timeit.repeat(decode, number=100, repeat=repeat)) / 100 * 1e6
+        for name, decode in [("per-element", per_element), ("vectorised", vectorised)]
+    }
+
+
+def bench_encode(length: int, width: int, repeat: int) -> dict[str, float]:
+    """
+    us to encode one beat of a `length` x `width`-bit signed array port per element and vectorised,
+    excluding the simulator writes. cocotb encodes elements wider than 32 bits through BinaryValue.
+    """
+    from cocotb.binary import BinaryRepresentation, BinaryValue
+
+    values = np.random.randint(-(2 ** (width - 1)), 2 ** (width - 1), size=length, dtype=np.int64)
+    value_list = values.tolist()
+
+    def per_element():
+        return [
+            BinaryValue(
+                v, n_bits=width, bigEndian=False, binaryRepresentation=BinaryRepresentation.TWOS_COMPLEMENT
+            ).binstr
+            for v in value_list
+        ]
+
+    def vectorised():
+        return encode_binstr(values, width)
+
+    assert "".join(per_element()) == vectorised()
+    return {
+        name: min(timeit.repeat(encode, number=100, repeat=repeat)) / 100 * 1e6
+        for name, encode in [("per-element", per_element), ("vectorised", vectorised)]
+    }
+
+
+def bench_schedule(num_cycles: int, prob: float, repeat: int) -> dict[str, tuple[float, int]]:
+    """
+    (ns per cycle, number of wake-ups) to decide a Bernoulli `prob` handshake signal for `num_cycles` cycles,
+    rolling `random.random()` every cycle and consuming a Schedule run by run.
+
+    Only the number of wake-ups is meaningful. Outside a simulator the ns per cycle is only the cost of drawing
+    the values, about the same either way. In a cocotb simulation each wake-up is a trigger and a GPI callback
+    round trip, which costs far more than the draw, so the saving scales with the wake-ups.
+    """
+
+    def per_cycle():
+        wakeups = 0
+        for _ in range(num_cycles):
+            wakeups += 1
+            _ = 1 if random.random() < prob else 0
+        return wakeups
+
+    def per_run():
+        schedule, cycles, wakeups = Schedule.bernoulli(prob, seed=0), 0, 0
+        while cycles < num_cycles:
+            _, length = schedule.next_run()
+            cycles += length
+            wakeups += 1
+        return wakeups
+
+    results = {}
+    for name, decide in [("per-cycle", per_cycle), ("schedule", per_run)]:
+        elapsed = min(timeit.repeat(decide, number=1, repeat=repeat))
+        results[name] = (elapsed / num_cycles * 1e9, decide())
+    return results
+
+
+def bench_check(num_beats: int, num_elements: int, chunk_size: int, repeat: int) -> dict[str, float]:
+    """
+    ns per beat to check int64 beats of `num_elements` elements against a bulk-loaded expected array,
+    with a per-beat assert as in StreamMonitor._check and with a Scoreboard
+    """
+    got = np.random.randint(-128, 128, size=(num_beats, num_elements), dtype=np.int64)
+    beats = list(got)
+
+    def per_beat():
+        queue = BeatQueue()
+        queue.extend(got)
+        for beat in beats:
+            exp = queue.popleft()
+            assert np.equal(beat, exp).all(), f"Got \n{beat}, \nExpected \n{exp}"
+
+    def batched():
+        queue, scoreboard = BeatQueue(), Scoreboard(chunk_size)
+        queue.extend(got)
+        for cycle, beat in enumerate(beats):
+            scoreboard.record(beat, cycle)
+            if scoreboard.full or len(scoreboard) >= len(queue):
+                scoreboard.compare(queue.popleft_array(len(scoreboard)))
+        scoreboard.finish()
+
+    return {
+        name: min(timeit.repeat(check, number=1, repeat=repeat)) / num_beats * 1e9
+        for name, check in [("per-beat", per_beat), ("scoreboard", batched)]
+    }
+
+
+def bench_wide(num_words: int, width: int, repeat: int) -> dict[str, float]:
+    """
+    ns per word to generate, encode to bit strings, decode and check a batch of `width`-bit words,
+    with Python ints and with uint64 limbs
+    """
+
+    def big_int():
+        words = [random.getrandbits(width) for _ in range(num_words)]
+        binstrs = [format(w, f"0{width}b") for w in words]
+        decoded = [int(b, 2) for b in binstrs]
+        assert all(d & ((1 << width) - 1) == w for d, w in zip(decoded, words))
+
+    def limbs():
+        words = wide.random_limbs(np.random.default_rng(0), num_words, width)
+        decoded = wide.decode_binstr(wide.encode_binstr(words, width), width)
+        assert wide.equal(wide.mask(decoded, width), words).all()
+
+    return {
+        name: min(timeit.repeat(run, number=1, repeat=repeat)) / num_words * 1e9
+        for name, run in [("big-int", big_int), ("limbs", limbs)]
+    }
+
+
+def bench_matmul(batch: int, size: int, width: int, repeat: int) -> dict[str, float]:
+    """
+    ns per multiply-accumulate of a fixed-point (batch, size, size) x (size, size) matmul with 1 output fractional bit,
+    as an int64 matmul followed by quantize_to_fixed_point and with fixed_point_matmul
+    """
+    rng = np.random.default_rng(0)
+    a = rng.integers(-(2 ** (width - 1)), 2 ** (width - 1), size=(batch, size, size))
+    b = rng.integers(-(2 ** (width - 1)), 2 ** (width - 1), size=(size, size))
+    frac_width = width // 2
+
+    def int64():
+        return quantize_to_fixed_point((a @ b) / 2 ** (2 * frac_width), 2 * width, 1, rounding="nearest")
+
+    def engine():
+        return fixed_point_matmul(a, b, width, frac_width, width, frac_width, 2 * width, 1)
+
+    assert (int64() == engine()).all()
+    return {
+        name: min(timeit.repeat(run, number=1, repeat=repeat)) / (batch * size**3) * 1e9
+        for name, run in [("int64", int64), ("engine", engine)]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m lqer_cocotb.benchmark")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    queue_parser = subparsers.add_parser("queue", help="per-beat overhead of the Driver/Monitor queues")
+    queue_parser.add_argument("--num-beats", type=int, default=100_000)
+    queue_parser.add_argument("--repeat", type=int, default=5)
+    load_parser = subparsers.add_parser("load", help="time and memory to load transactions into a driver")
+    load_parser.add_argument("--num-beats", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    load_parser.add_argument("--num-elements", type=int, default=16)
+    decode_parser = subparsers.add_parser("decode", help="decode cost of an array port per beat")
+    decode_parser.add_argument("--length", type=int, default=256)
+    decode_parser.add_argument("--width", type=int, default=16)
+    decode_parser.add_argument("--repeat", type=int, default=5)
+    encode_parser = subparsers.add_parser("encode", help="encode cost of an array port per beat")
+    encode_parser.add_argument("--length", type=int, default=256)
+    encode_parser.add_argument("--width", type=int, default=48)
+    encode_parser.add_argument("--repeat", type=int, default=5)
+    schedule_parser = subparsers.add_parser("schedule", help="cost of randomising valid/ready per cycle")
+    schedule_parser.add_argument("--num-cycles", type=int, default=1_000_000)
+    schedule_parser.add_argument("--prob", type=float, default=0.1)
+    schedule_parser.add_argument("--repeat", type=int, default=5)
+    check_parser = subparsers.add_parser("check", help="cost of checking received beats per beat and batched")
+    check_parser.add_argument("--num-beats", type=int, default=100_000)
+    check_parser.add_argument("--num-elements", type=int, default=16)
+    check_parser.add_argument("--chunk-size", type=int, default=1024)
+    check_parser.add_argument("--repeat", type=int, default=5)
+    wide_parser = subparsers.add_parser("wide", help="cost of handling wide words as Python ints and as limbs")
+    wide_parser.add_argument("--num-words", type=int, default=10_000)
+    wide_parser.add_argument("--width", type=int, default=256)
+    wide_parser.add_argument("--repeat", type=int, default=5)
+    matmul_parser = subparsers.add_parser("matmul", help="cost of the fixed-point matmul reference per MAC")
+    matmul_parser.add_argument("--batch", type=int, default=8)
+    matmul_parser.add_argument("--size", type=int, default=256)
+    matmul_parser.add_argument("--width", type=int, default=8)
+    matmul_parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    match args.benchmark:
+        case "queue":
+            results = bench_queue(args.num_beats, args.repeat)
+            for name, ns_per_beat in results.items():
+                print(f"{name:<12} {ns_per_beat:8.1f} ns/beat")
+            print(f"speedup      {results['queue.Queue'] / results['deque']:8.1f}x")
+        case "load":
+            print(f"{'beats':>9} {'per-beat(ms)':>13} {'per-beat(MB)':>13} {'bulk(ms)':>9} {'bulk(MB)':>9}")
+            for num_beats in args.num_beats:
+                results = bench_load(num_beats, args.num_elements)
+                (t_beat, m_beat), (t_bulk, m_bulk) = results["per-beat"], results["bulk"]
+                print(f"{num_beats:>9} {t_beat:>13.2f} {m_beat:>13.2f} {t_bulk:>9.3f} {m_bulk:>9.3f}")
+        case "decode" | "encode":
+            bench = bench_decode if args.benchmark == "decode" else bench_encode
+            results = bench(args.length, args.width, args.repeat)
+            for name, us_per_beat in results.items():
+                print(f"{name:<12} {us_per_beat:8.1f} us/beat")
+            print(f"speedup      {results['per-element'] / results['vectorised']:8.1f}x")
+        case "schedule":
+            results = bench_schedule(args.num_cycles, args.prob, args.repeat)
+            for name, (ns_per_cycle, wakeups) in results.items():
+                print(f"{name:<12} {ns_per_cycle:8.1f} ns/cycle {wakeups:>9} wake-ups")
+            print(f"wake-ups     {results['per-cycle'][1] / results['schedule'][1]:8.1f}x fewer")
+        case "check":
+            results = bench_check(args.num_beats, args.num_elements, args.chunk_size, args.repeat)
+            for name, ns_per_beat in results.items():
+                print(f"{name:<12} {ns_per_beat:8.1f} ns/beat")
+            print(f"speedup      {results['per-beat'] / results['scoreboard']:8.1f}x")
+        case "wide":
+            results = bench_wide(args.num_words, args.width, args.repeat)
+            for name, ns_per_word in results.items():
+                print(f"{name:<12} {ns_per_word:8.1f} ns/word")
+            print(f"speedup      {results['big-int'] / results['limbs']:8.1f}x")
+        case "matmul":
+            results = bench_matmul(args.batch, args.size, args.width, args.repeat)
+            for name, ns_per_mac in results.items():
+                print(f"{name:<12} {ns_per_mac:8.3f} ns/MAC")
+            print(f"speedup      {results['int64'] / results['engine']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import cocotb
+
+logger = logging.getLogger(__name__)
+
+# simulator name -> executable whose identity is hashed into the cache key
+SIMULATOR_EXECUTABLES = {
+    "verilator": "verilator",
+    "icarus": "iverilog",
+    "questa": "vlog",
+}
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+class BuildCache:
+    """
+    Content-addressed cache of compiled simulators.
+
+    Each entry is a copy of a build directory right after `runner.build`, keyed on a hash of
+    the RTL sources, includes, parameters, simulator and build args.
+    Entries are evicted in least-recently-used order once the cache exceeds `max_size` bytes.
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"BuildCache({self.cache_dir}, max_size={self.max_size})"
+
+    @staticmethod
+    def key(
+        simulator: str,
+        module_name: str,
+        sv_sources: list[str],
+        includes: list[Path],
+        module_params: dict[str, int],
+        build_args: list[str],
+    ) -> str:
+        h = hashlib.sha256()
+        header = {
+            "simulator": simulator,
+            "module_name": module_name,
+            "module_params": sorted((k, str(v)) for k, v in module_params.items()),
+            "build_args": list(build_args),
+            "cocotb": cocotb.__version__,
+        }
+        executable = shutil.which(SIMULATOR_EXECUTABLES.get(simulator, simulator))
+        if executable is not None:
+            stat = Path(executable).stat()
+            header["executable"] = [executable, stat.st_size, stat.st_mtime_ns]
+        h.update(json.dumps(header, sort_keys=True).encode())
+
+        files = [Path(src) for src in sv_sources]
+        for include in includes:
+            files.extend(f for f in Path(include).rglob("*") if f.is_file())
+        for f in sorted(set(files)):
+            h.update(f.as_posix().encode())
+            h.update(f.read_bytes())
+        return h.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def restore(self, key: str, build_dir: Path) -> bool:
+        """
+        copy the cached build of `key` to `build_dir`, return False on a cache miss
+        """
+        entry = self._entry(key)
+        if not entry.is_dir():
+            return False
+        try:
+            shutil.copytree(entry, build_dir, symlinks=True, dirs_exist_ok=True)
+            os.utime(entry)  # mark as recently used
+        except OSError as e:
+            # the entry may be evicted by another worker while copying
+            logger.warning(f"Failed to restore build cache entry {key}: {e}")
+            return False
+        logger.info(f"Build cache hit {key[:12]}, skip build")
+        return True
+
+    def store(self, key: str, build_dir: Path) -> None:
+        entry = self._entry(key)
+        if entry.is_dir():
+            return
+        tmp_dir = Path(tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp_"))
+        try:
+            shutil.copytree(build_dir, tmp_dir, symlinks=True, dirs_exist_ok=True)
+            os.rename(tmp_dir, entry)
+        except OSError:
+            # another worker stored the same key first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        logger.debug(f"Stored build cache entry {key[:12]}")
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, _dir_size(entry), entry))
+            except FileNotFoundError:
+                # evicted by another worker
+                continue
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+            logger.debug(f"Evicted build cache entry {entry.name[:12]}")
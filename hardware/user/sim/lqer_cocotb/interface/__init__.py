@@ -1,2 +1,20 @@
-from .streaming import StreamDriver, StreamMonitor
-from .driver import bit_driver
+# the interfaces are imported on first use, so that importing lqer_cocotb.interface.engine does not load numpy
+_EXPORTS = {
+    "StreamDriver": "streaming",
+    "StreamMonitor": "streaming",
+    "bit_driver": "driver",
+    "schedule_driver": "driver",
+    "Schedule": "schedule",
+    "Engine": "engine",
+    "Scoreboard": "scoreboard",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        from importlib import import_module
+
+        return getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
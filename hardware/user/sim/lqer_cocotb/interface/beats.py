@@ -0,0 +1,192 @@
+from collections import deque
+
+import numpy as np
+
+from ..utils import is_ndarray, is_tensor
+
+
+class _ArraySource:
+    """
+    Beats of an array stored in one contiguous block, converted to Python values one beat at a time
+    """
+
+    def __init__(self, array: np.ndarray) -> None:
+        self.array = np.ascontiguousarray(array)
+        self.index = 0
+
+    def __len__(self) -> int:
+        return len(self.array) - self.index
+
+    def pop(self):
+        beat = self.array[self.index].tolist()
+        self.index += 1
+        return beat
+
+
+class _SequenceSource:
+    """
+    Beats of a sequence, referenced without copying
+    """
+
+    def __init__(self, beats) -> None:
+        self.beats = beats
+        self.index = 0
+
+    def __len__(self) -> int:
+        return len(self.beats) - self.index
+
+    def pop(self):
+        beat = self.beats[self.index]
+        self.index += 1
+        return beat
+
+
+class _IteratorSource:
+    """
+    Beats of an iterator, pulled `window` beats at a time when the buffered beats run out
+    """
+
+    def __init__(self, iterator, window: int) -> None:
+        self.iterator = iterator
+        self.window = window
+        self.buffer = deque()
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def fill(self) -> int:
+        """
+        pull up to `window` beats from the iterator, return the number of beats pulled
+        """
+        for _ in range(self.window):
+            try:
+                self.buffer.append(next(self.iterator))
+            except StopIteration:
+                break
+        return len(self.buffer)
+
+    def pop(self):
+        return self.buffer.popleft()
+
+
+def _as_array(beats) -> np.ndarray | None:
+    """
+    `beats` as a numpy array of shape (num_beats, ...), None if it is neither a tensor nor an array
+    """
+    if is_tensor(beats):
+        return beats.detach().cpu().numpy()
+    elif is_ndarray(beats):
+        return beats
+    return None
+
+
+class BeatQueue:
+    """
+    FIFO of transactions for drivers and monitors.
+
+    Single transactions are appended as is. Bulk loads are kept as one source per load,
+    in their compact form, and expanded into transactions one beat at a time when popped.
+    Iterators and generators are pulled on demand, at most `window` beats at a time,
+    so that the memory stays bounded however many beats they produce.
+    `len()` counts the pending beats known so far, which excludes the beats not yet pulled from iterators.
+    """
+
+    def __init__(self) -> None:
+        # (is_source, transaction or source) in FIFO order
+        self._entries = deque()
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        if self._len > 0:
+            return True
+        # only iterator sources with empty buffers are left
+        return self._fill_head()
+
+    def _fill_head(self) -> bool:
+        """
+        make sure the head entry has a beat to pop, dropping exhausted iterators, return False if the queue is empty
+        """
+        while self._entries:
+            is_source, entry = self._entries[0]
+            if not is_source or len(entry) > 0:
+                return True
+            num_pulled = entry.fill()
+            if num_pulled > 0:
+                self._len += num_pulled
+                return True
+            self._entries.popleft()
+        return False
+
+    def append(self, transaction) -> None:
+        self._entries.append((False, transaction))
+        self._len += 1
+
+    def extend(self, beats, window: int = 64) -> tuple[int | None, tuple | None]:
+        """
+        enqueue the beats of a numpy array, torch tensor (beats x elements) or sequence without copying them,
+        or of an iterator/generator pulled `window` beats at a time.
+        Return the number of beats and the shape of the load, both None for iterators.
+        """
+        array = _as_array(beats)
+        if array is not None:
+            source = _ArraySource(array)
+            shape = array.shape
+        elif hasattr(beats, "__getitem__") and hasattr(beats, "__len__"):
+            source = _SequenceSource(beats)
+            shape = (len(beats),)
+        else:
+            assert window > 0, f"Invalid window: {window}"
+            self._entries.append((True, _IteratorSource(iter(beats), window)))
+            return None, None
+        if len(source) > 0:
+            self._entries.append((True, source))
+            self._len += len(source)
+        return len(source), shape
+
+    def popleft(self):
+        if not self._fill_head():
+            raise IndexError("pop from an empty BeatQueue")
+        is_source, entry = self._entries[0]
+        self._len -= 1
+        if not is_source:
+            self._entries.popleft()
+            return entry
+        transaction = entry.pop()
+        if len(entry) == 0 and not isinstance(entry, _IteratorSource):
+            self._entries.popleft()
+        return transaction
+
+    def popleft_array(self, num_beats: int) -> np.ndarray:
+        """
+        pop the next `num_beats` beats as one array, slicing bulk-loaded arrays instead of converting beat by beat
+        """
+        # array slices and runs of single beats, in order
+        chunks, beats = [], []
+        while num_beats > 0:
+            if not self._fill_head():
+                raise IndexError("pop from an empty BeatQueue")
+            is_source, entry = self._entries[0]
+            if is_source and isinstance(entry, _ArraySource):
+                if beats:
+                    chunks.append(np.asarray(beats))
+                    beats = []
+                n = min(num_beats, len(entry))
+                chunks.append(entry.array[entry.index : entry.index + n])
+                entry.index += n
+                self._len -= n
+                if len(entry) == 0:
+                    self._entries.popleft()
+                num_beats -= n
+            else:
+                beats.append(self.popleft())
+                num_beats -= 1
+        if beats:
+            chunks.append(np.asarray(beats))
+        return np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._len = 0
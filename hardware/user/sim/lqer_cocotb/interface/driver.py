@@ -1,18 +1,25 @@
-import random
-from queue import Queue
-
 import cocotb
 from cocotb.log import SimLog
 from cocotb.decorators import coroutine
 from cocotb.triggers import *
 
+from .beats import BeatQueue
+from .schedule import Schedule
+
 
 class Driver:
     """Simplified version of cocotb_bus.drivers.Driver"""
 
     def __init__(self):
         self._pending = Event(name="Driver._pending")
-        self.send_queue = Queue()
+        self._drained = Event(name="Driver._drained")
+        self._drained.set()
+        # coroutines run in a single thread, no need for a synchronised queue.Queue
+        self.send_queue = BeatQueue()
+        # the transaction being sent, handed over to the Engine if attached mid-send
+        self._current = None
+        self._sending = False
+        self._engine = False
 
         if not hasattr(self, "log"):
             self.logger = SimLog(f"lqer_cocotb.driver.{(type(self).__qualname__)}")
@@ -26,29 +33,92 @@ class Driver:
             self._thread = None
 
     def append(self, transaction) -> None:
-        self.send_queue.put(transaction)
+        self.send_queue.append(transaction)
+        self._drained.clear()
         self._pending.set()
 
     async def _send_thread(self):
         while True:
             # Sleep until we have something to send
-            while self.send_queue.empty():
+            while not self.send_queue:
                 self._pending.clear()
                 await self._pending.wait()
 
             # Send in all the queued packets,
             # only synchronize on the first send
-            while not self.send_queue.empty():
-                transaction = self.send_queue.get()
-                await self.send(transaction)
+            while self.send_queue:
+                self._current = self.send_queue.popleft()
+                self._sending = True
+                await self.send(self._current)
+                self._sending = False
+            self._drained.set()
+
+    def _attach_engine(self) -> None:
+        """
+        hand the driving over to an Engine, which calls `_on_falling_edge` and `_on_read_only` every cycle
+        """
+        self.kill()
+        self._engine = True
+
+    def _next_transaction(self) -> bool:
+        """
+        in engine mode, make sure a transaction is being sent, return False if there is none
+        """
+        if not self._sending:
+            if not self.send_queue:
+                return False
+            self._current = self.send_queue.popleft()
+            self._sending = True
+        return True
+
+    def _sent(self) -> None:
+        """
+        in engine mode, retire the transaction being sent
+        """
+        self.logger.debug(f"Sent {self._current}")
+        self._current = None
+        self._sending = False
+        if not self.send_queue:
+            self._drained.set()
+
+    def _on_falling_edge(self) -> bool:
+        """
+        in engine mode, drive the bus for this cycle, return True if `_on_read_only` should be called in this cycle
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support the Engine")
+
+    def _on_read_only(self) -> None:
+        """
+        in engine mode, sample the handshake of this cycle
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support the Engine")
+
+    async def wait_drained(self, timeout: float | None = None, units: str = "ns") -> None:
+        """
+        wait until every queued transaction has been sent, raise SimTimeoutError if it takes longer than `timeout`
+        """
+        if timeout is None:
+            await self._drained.wait()
+        else:
+            await with_timeout(self._drained.wait(), timeout, units)
 
     def clear(self):
-        self.send_queue = Queue()
+        self.send_queue.clear()
 
-    def load_driver(self, tensor):
-        for beat in tensor:
-            self.logger.info(f"Loaded beat {beat} to driver {self.__class__.__name__}")
-            self.append(beat)
+    def load_driver(self, tensor, window: int = 64):
+        """
+        queue the beats of a numpy array, torch tensor (beats x elements) or sequence of beats.
+        The beats are kept in their compact form and converted to transactions one at a time while driving.
+        An iterator or generator of beats is pulled on demand, `window` beats at a time.
+        """
+        num_beats, shape = self.send_queue.extend(tensor, window=window)
+        if self.send_queue:
+            self._drained.clear()
+            self._pending.set()
+        if num_beats is None:
+            self.logger.info(f"Loaded a beat iterator (window={window}) to driver {self.__class__.__name__}")
+        else:
+            self.logger.info(f"Loaded {num_beats} beats of shape {shape} to driver {self.__class__.__name__}")
 
     @coroutine
     async def send(self, transaction) -> None:
@@ -68,7 +138,17 @@ class Driver:
         raise NotImplementedError("Sub-classes of Driver should define a _driver_send coroutine")
 
 
-async def bit_driver(signal, clk, prob):
+async def schedule_driver(signal, clk, schedule: Schedule):
+    """
+    drive `signal` with the on/off pattern of `schedule`, changing it after rising edges of `clk`.
+    Each run of equal values is held with a single await.
+    """
+    await RisingEdge(clk)
     while True:
-        await RisingEdge(clk)
-        signal.value = 1 if random.random() < prob else 0
+        value, num_cycles = schedule.next_run()
+        signal.value = value
+        await ClockCycles(clk, num_cycles)
+
+
+async def bit_driver(signal, clk, prob):
+    await schedule_driver(signal, clk, Schedule.bernoulli(prob))
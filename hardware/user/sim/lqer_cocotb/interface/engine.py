@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from cocotb.log import SimLog
+from cocotb.triggers import FallingEdge, ReadOnly
+
+if TYPE_CHECKING:
+    from .driver import Driver
+    from .monitor import Monitor
+
+
+class Engine:
+    """
+    One coroutine servicing every driver and monitor of a clock domain, instead of a coroutine per interface.
+
+    Each cycle takes one falling-edge callback, in which the monitors check the handshakes of the cycle
+    and drive their ready schedules, then the drivers drive their buses, and at most one read-only callback,
+    in which the drivers that asserted valid sample ready.
+
+    `drivers` and `monitors` are referenced, not copied: interfaces appended later are attached at the next cycle.
+    Attaching kills the interface's own coroutines. Ready signals driven by `bit_driver` or `schedule_driver`
+    keep their own coroutines, use `StreamMonitor.set_ready_schedule` to have them serviced by the engine.
+    """
+
+    def __init__(self, clk, drivers: list[Driver], monitors: list[Monitor]) -> None:
+        self.clk = clk
+        self.drivers = drivers
+        self.monitors = monitors
+        self._num_attached = (0, 0)
+        self.logger = SimLog(f"lqer_cocotb.{type(self).__qualname__}")
+
+    def _attach(self) -> None:
+        num_drivers, num_monitors = self._num_attached
+        for driver in self.drivers[num_drivers:]:
+            driver._attach_engine()
+        for monitor in self.monitors[num_monitors:]:
+            monitor._attach_engine()
+        self._num_attached = (len(self.drivers), len(self.monitors))
+        self.logger.debug(f"Servicing {len(self.drivers)} drivers and {len(self.monitors)} monitors")
+
+    async def run(self) -> None:
+        self._attach()
+        falling_edge, read_only = FallingEdge(self.clk), ReadOnly()
+        while True:
+            await falling_edge
+            if self._num_attached != (len(self.drivers), len(self.monitors)):
+                self._attach()
+
+            for monitor in self.monitors:
+                monitor._on_falling_edge()
+            handshaking = [driver for driver in self.drivers if driver._on_falling_edge()]
+
+            if handshaking:
+                await read_only
+                for driver in handshaking:
+                    driver._on_read_only()
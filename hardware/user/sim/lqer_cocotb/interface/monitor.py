@@ -1,19 +1,31 @@
-from queue import Queue
-
 import cocotb
 from cocotb.log import SimLog
-from cocotb.triggers import RisingEdge, FallingEdge
+from cocotb.triggers import Event, RisingEdge, FallingEdge, with_timeout
 from cocotb.result import TestFailure
 
+from .beats import BeatQueue
+from .scoreboard import Scoreboard
+
 
 class Monitor:
-    """Simplified version of cocotb_bus.monitors.Monitor"""
+    """
+    Simplified version of cocotb_bus.monitors.Monitor
 
-    def __init__(self, clk, check=True):
+    scoreboard: check the received transactions for equality in batches instead of calling `_check` per beat
+    """
+
+    def __init__(self, clk, check=True, stall_limit: int | None = None, scoreboard: Scoreboard | None = None):
         self.clk = clk
-        self.recv_queue = Queue()
-        self.exp_queue = Queue()
+        self.stall_limit = stall_limit
+        self.exp_queue = BeatQueue()
         self.check = check
+        self.scoreboard = scoreboard
+        # falling edges seen, the cycle reported by the scoreboard
+        self._cycle = 0
+        self._checked = Event(name="Monitor._checked")
+        self._checked.set()
+        self._stall_cycles = 0
+        self._engine = False
 
         if not hasattr(self, "log"):
             self.logger = SimLog(f"lqer_cocotb.monitor.{(type(self).__qualname__)}")
@@ -26,25 +38,75 @@ class Monitor:
             self._thread = None
 
     def expect(self, transaction):
-        self.exp_queue.put(transaction)
+        self.exp_queue.append(transaction)
+        self._checked.clear()
+
+    async def wait_checked(self, timeout: float | None = None, units: str = "ns") -> None:
+        """
+        wait until every expected transaction has been received and checked,
+        raise SimTimeoutError if it takes longer than `timeout`
+        """
+        if timeout is None:
+            await self._checked.wait()
+        else:
+            await with_timeout(self._checked.wait(), timeout, units)
 
     async def _recv_thread(self):
         while True:
             await FallingEdge(self.clk)
-            if self._trigger():
-                tr = self._recv()
-                self.logger.debug(f"Observed output beat {tr}")
-                self.recv_queue.put(tr)
-
-                assert (
-                    not self.exp_queue.empty()
-                ), f"\nGot \n{self.recv_queue.get()},\nbut we did not expect anything."
-
-                self._check(self.recv_queue.get(), self.exp_queue.get())
+            self._on_falling_edge()
+
+    def _on_falling_edge(self) -> None:
+        """
+        receive and check a transaction if one is presented in this cycle
+        """
+        if not self._trigger():
+            if self.stall_limit is not None and self.exp_queue:
+                self._stall_cycles += 1
+                assert self._stall_cycles <= self.stall_limit, (
+                    f"{type(self).__name__} stalled for {self._stall_cycles} cycles without receiving: {self._state()}"
+                )
+        else:
+            self._stall_cycles = 0
+            tr = self._recv()
+            self.logger.debug(f"Observed output beat {tr}")
+
+            assert self.exp_queue, f"\nGot \n{tr},\nbut we did not expect anything."
+
+            if self.scoreboard is None:
+                self._check(tr, self.exp_queue.popleft())
+            else:
+                # the received beats stay in exp_queue until compared
+                self.scoreboard.record(tr, self._cycle)
+                if self.scoreboard.full or len(self.scoreboard) >= len(self.exp_queue):
+                    self._compare()
+            if not self.exp_queue:
+                if self.scoreboard is not None:
+                    self.scoreboard.finish()
+                self._checked.set()
+        self._cycle += 1
+
+    def _compare(self) -> None:
+        exp = self.exp_queue.popleft_array(len(self.scoreboard))
+        if self.check:
+            self.scoreboard.compare(exp)
+        else:
+            self.scoreboard.clear()
+
+    def _attach_engine(self) -> None:
+        """
+        hand the monitoring over to an Engine, which calls `_on_falling_edge` every cycle
+        """
+        self.kill()
+        self._engine = True
 
     def _trigger(self):
         raise NotImplementedError()
 
+    def _state(self) -> str:
+        num_received = 0 if self.scoreboard is None else len(self.scoreboard)
+        return f"{len(self.exp_queue) - num_received} transactions expected"
+
     def _recv(self):
         raise NotImplementedError()
 
@@ -52,9 +114,22 @@ class Monitor:
         raise NotImplementedError()
 
     def clear(self):
-        self.send_queue = Queue()
-
-    def load_monitor(self, tensor):
-        for beat in tensor:
-            self.logger.info(f"Expecting output beat {beat}")
-            self.expect(beat)
+        self.exp_queue.clear()
+        if self.scoreboard is not None:
+            self.scoreboard.clear()
+        self._checked.set()
+
+    def load_monitor(self, tensor, window: int = 64):
+        """
+        expect the beats of a numpy array, torch tensor (beats x elements) or sequence of beats.
+        The beats are kept in their compact form and converted to transactions one at a time while checking.
+        An iterator or generator of beats, e.g. a golden model fed by the same seeded stimulus generator
+        as the driver, is pulled on demand, `window` beats at a time.
+        """
+        num_beats, shape = self.exp_queue.extend(tensor, window=window)
+        if self.exp_queue:
+            self._checked.clear()
+        if num_beats is None:
+            self.logger.info(f"Expecting output beats from an iterator (window={window})")
+        else:
+            self.logger.info(f"Expecting {num_beats} output beats of shape {shape}")
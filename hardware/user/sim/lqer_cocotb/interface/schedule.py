@@ -0,0 +1,158 @@
+import random
+from collections.abc import Iterator
+
+import numpy as np
+
+# cycles generated per block
+BLOCK_SIZE = 4096
+
+
+def _bernoulli_blocks(rng: np.random.Generator, prob: float) -> Iterator[np.ndarray]:
+    while True:
+        yield rng.random(BLOCK_SIZE) < prob
+
+
+def _periodic_blocks(period: int, on_cycles: int, phase: int) -> Iterator[np.ndarray]:
+    pattern = np.roll(np.arange(period) < on_cycles, phase)
+    block = np.tile(pattern, -(-BLOCK_SIZE // period))
+    while True:
+        yield block
+
+
+def _run_blocks(rng: np.random.Generator, draw_on, draw_off, start_on: bool) -> Iterator[np.ndarray]:
+    """
+    alternating on/off runs whose lengths are drawn in bulk by `draw_on(rng, n)` and `draw_off(rng, n)`
+    """
+    # enough runs for about a block of cycles
+    num_runs = BLOCK_SIZE // 8
+    values = np.tile([start_on, not start_on], num_runs)
+    while True:
+        on_lengths, off_lengths = draw_on(rng, num_runs), draw_off(rng, num_runs)
+        lengths = np.stack([on_lengths, off_lengths] if start_on else [off_lengths, on_lengths], axis=1).ravel()
+        yield np.repeat(values, lengths)
+
+
+class Schedule:
+    """
+    Precomputed on/off pattern of a handshake signal, one value per clock cycle.
+
+    The cycles are generated in blocks with a seeded numpy Generator and consumed as runs of equal values,
+    so that a driver can wait out a whole run with a single `ClockCycles` instead of waking up every cycle.
+    `seed` defaults to a draw from `random`, which cocotb seeds with the test seed.
+    """
+
+    def __init__(self, blocks: Iterator[np.ndarray]) -> None:
+        self._blocks = blocks
+        self._values = []
+        self._lengths = []
+        self._index = 0
+        self._left = 0
+
+    @staticmethod
+    def _rng(seed: int | None) -> np.random.Generator:
+        return np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+
+    @classmethod
+    def bernoulli(cls, prob: float, seed: int | None = None) -> "Schedule":
+        """
+        on with probability `prob` in each cycle
+        """
+        assert 0.0 <= prob <= 1.0, f"Invalid probability: {prob}"
+        return cls(_bernoulli_blocks(cls._rng(seed), prob))
+
+    @classmethod
+    def periodic(cls, period: int, on_cycles: int, phase: int = 0) -> "Schedule":
+        """
+        on for the first `on_cycles` cycles of every `period` cycles, shifted by `phase` cycles
+        """
+        assert 0 <= on_cycles <= period and period > 0, f"Invalid periodic schedule: {on_cycles} of {period}"
+        return cls(_periodic_blocks(period, on_cycles, phase))
+
+    @classmethod
+    def burst(cls, max_on: int, max_off: int, seed: int | None = None) -> "Schedule":
+        """
+        bursts of 1 to `max_on` on cycles separated by gaps of 1 to `max_off` off cycles, lengths uniformly random
+        """
+        assert max_on > 0 and max_off > 0, f"Invalid burst schedule: {max_on}, {max_off}"
+        return cls(
+            _run_blocks(
+                cls._rng(seed),
+                lambda rng, n: rng.integers(1, max_on + 1, n),
+                lambda rng, n: rng.integers(1, max_off + 1, n),
+                start_on=True,
+            )
+        )
+
+    @classmethod
+    def markov(cls, p_on_to_off: float, p_off_to_on: float, seed: int | None = None) -> "Schedule":
+        """
+        two-state Markov chain switching from on to off with probability `p_on_to_off` per cycle
+        and back with probability `p_off_to_on`, i.e. geometrically distributed run lengths
+        """
+        assert 0.0 < p_on_to_off <= 1.0 and 0.0 < p_off_to_on <= 1.0, "Invalid Markov schedule"
+        rng = cls._rng(seed)
+        start_on = bool(rng.random() < p_off_to_on / (p_on_to_off + p_off_to_on))  # stationary distribution
+        return cls(
+            _run_blocks(
+                rng,
+                lambda rng, n: rng.geometric(p_on_to_off, n),
+                lambda rng, n: rng.geometric(p_off_to_on, n),
+                start_on=start_on,
+            )
+        )
+
+    def _next_block(self) -> None:
+        block = next(self._blocks)
+        starts = np.flatnonzero(np.diff(block, prepend=~block[:1]))
+        self._values = block[starts].astype(int).tolist()
+        self._lengths = np.diff(starts, append=len(block)).tolist()
+        self._index = 0
+        self._left = self._lengths[0]
+
+    def next_run(self) -> tuple[int, int]:
+        """
+        consume the rest of the current run, return its value and number of cycles.
+        Runs may be split at block boundaries.
+        """
+        if self._left == 0:
+            self._index += 1
+            if self._index >= len(self._values):
+                self._next_block()
+            else:
+                self._left = self._lengths[self._index]
+        length, self._left = self._left, 0
+        return self._values[self._index], length
+
+    def next_cycle(self) -> int:
+        """
+        consume the next cycle, return its value
+        """
+        value, length = self.next_run()
+        self._left = length - 1
+        return value
+
+    def idle_cycles(self) -> int:
+        """
+        consume the next cycle and return 0 if it is on,
+        otherwise consume the off run starting at the next cycle and return its length
+        """
+        value, length = self.next_run()
+        if value:
+            # give back all but one on cycle
+            self._left = length - 1
+            return 0
+        return length
+
+    def take(self, num_cycles: int) -> np.ndarray:
+        """
+        consume the next `num_cycles` cycles, return their values
+        """
+        values = []
+        while num_cycles > 0:
+            value, length = self.next_run()
+            if length > num_cycles:
+                self._left = length - num_cycles
+                length = num_cycles
+            values.append(np.full(length, value, dtype=bool))
+            num_cycles -= length
+        return np.concatenate(values) if values else np.zeros(0, dtype=bool)
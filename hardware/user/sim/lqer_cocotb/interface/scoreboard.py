@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class Scoreboard:
+    """
+    Batched equality check of the transactions received by a Monitor.
+
+    Received beats are written into a preallocated array of `chunk_size` beats together with the cycle they were
+    received in, and compared against the expected beats in one numpy call when the buffer is full
+    or when every expected beat has been received.
+
+    fail_fast: fail at the first chunk with a mismatch, i.e. at most `chunk_size` beats after it.
+        Otherwise the mismatches are counted and the test fails once every expected beat has been received.
+    """
+
+    def __init__(self, chunk_size: int = 1024, fail_fast: bool = False) -> None:
+        assert chunk_size > 0, f"Invalid chunk size: {chunk_size}"
+        self.chunk_size = chunk_size
+        self.fail_fast = fail_fast
+        self._got = None
+        self._cycles = np.zeros(chunk_size, dtype=np.int64)
+        self._len = 0
+        # beats compared so far, the index of the first beat in the buffer
+        self.num_checked = 0
+        self.num_mismatches = 0
+        self._first_mismatch = None
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def full(self) -> bool:
+        return self._len == self.chunk_size
+
+    def record(self, beat, cycle: int) -> None:
+        if self._got is None:
+            beat = np.asarray(beat)
+            dtype = beat.dtype if beat.dtype.kind in "biuf" else object
+            self._got = np.empty((self.chunk_size,) + beat.shape, dtype=dtype)
+        self._got[self._len] = beat
+        self._cycles[self._len] = cycle
+        self._len += 1
+
+    def compare(self, exp: np.ndarray) -> None:
+        """
+        compare the buffered beats against `exp` of the same length, then empty the buffer
+        """
+        num_beats = self._len
+        got = self._got[:num_beats]
+        exp = np.asarray(exp)
+        assert len(exp) == num_beats, f"Comparing {num_beats} received beats with {len(exp)} expected beats"
+        if got.shape != exp.shape:
+            raise AssertionError(
+                f"Got beats of shape {got.shape[1:]}, expected beats of shape {exp.shape[1:]} "
+                f"from beat {self.num_checked} at cycle {self._cycles[0]}"
+            )
+        mismatches = (got != exp).reshape(num_beats, -1).any(axis=1)
+        num_mismatches = int(np.count_nonzero(mismatches))
+        if num_mismatches > 0:
+            i = int(np.argmax(mismatches))
+            if self._first_mismatch is None:
+                self._first_mismatch = (self.num_checked + i, int(self._cycles[i]), got[i].tolist(), exp[i].tolist())
+            self.num_mismatches += num_mismatches
+        self.num_checked += num_beats
+        self._len = 0
+        if self.fail_fast:
+            self.finish()
+
+    def finish(self) -> None:
+        """
+        fail if any compared beat mismatched, reporting the first mismatch
+        """
+        if self._first_mismatch is None:
+            return
+        index, cycle, got, exp = self._first_mismatch
+        raise AssertionError(
+            f"{self.num_mismatches} of {self.num_checked} beats mismatched, the first at beat {index}, cycle {cycle}: "
+            f"Got \n{got}, \nExpected \n{exp}"
+        )
+
+    def clear(self) -> None:
+        self._len = 0
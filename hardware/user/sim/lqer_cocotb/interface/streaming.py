@@ -1,48 +1,149 @@
-import random
 import numpy as np
 from cocotb.binary import BinaryValue
 
+import cocotb
 import cocotb.triggers as cc_triggers
 
-from .driver import Driver
+from ..packed import PackedArray, packed_array
+from .driver import Driver, schedule_driver
 from .monitor import Monitor
+from .schedule import Schedule
+from .scoreboard import Scoreboard
 from .utils import binary_value_to_binstr, binary_value_to_integer, binary_value_to_signed_integer
 
 
+def _stream_state(data, valid, ready) -> str:
+    return f"data={data._name}, valid={valid.value}, ready={ready.value}"
+
+
 class StreamDriver(Driver):
-    def __init__(self, clk, data, valid, ready, valid_prob=1.0) -> None:
+    """
+    Drive `data` with valid/ready handshake.
+
+    valid_prob: probability of asserting valid in each cycle, a shorthand for a Bernoulli `valid_schedule`.
+    valid_schedule: the cycles in which valid may be asserted, overrides `valid_prob`.
+    stall_limit: fail the test if a transaction is not accepted within `stall_limit` cycles, disabled if None.
+    """
+
+    def __init__(
+        self,
+        clk,
+        data,
+        valid,
+        ready,
+        valid_prob=1.0,
+        stall_limit: int | None = None,
+        valid_schedule: Schedule | None = None,
+    ) -> None:
         super().__init__()
         self.clk = clk
         self.data = data
         self.valid = valid
         self.ready = ready
-        self.valid_prob = valid_prob
+        self.stall_limit = stall_limit
+        self._stall_cycles = 0
+        self._valid_high = False
+        self.set_valid_prob(valid_prob)
+        if valid_schedule is not None:
+            self.set_valid_schedule(valid_schedule)
+
+        # encode integer array ports in one go
+        self._packed = packed_array(data) if PackedArray.supports(data) else None
 
     def set_valid_prob(self, prob: float):
         assert prob >= 0.0 and prob <= 1.0
         self.valid_prob = prob
+        self.valid_schedule = None if prob == 1.0 else Schedule.bernoulli(prob)
+
+    def set_valid_schedule(self, schedule: Schedule | None):
+        """
+        assert valid only in the on cycles of `schedule`, always if None
+        """
+        self.valid_prob = None
+        self.valid_schedule = schedule
+
+    def _check_stall(self, stall_cycles: int) -> None:
+        assert self.stall_limit is None or stall_cycles <= self.stall_limit, (
+            f"{type(self).__name__} stalled for {stall_cycles} cycles without handshake: "
+            f"{len(self.send_queue) + 1} transactions pending, {_stream_state(self.data, self.valid, self.ready)}"
+        )
 
     async def _driver_send(self, data) -> None:
+        stall_cycles = 0
         while True:
             await cc_triggers.FallingEdge(self.clk)
-            if random.random() > self.valid_prob:
-                self.valid.value = 0
-                continue  # Try roll random valid again at next clock
-            self.data.value = data
+            self._check_stall(stall_cycles)
+            stall_cycles += 1
+            if self.valid_schedule is not None:
+                idle_cycles = self.valid_schedule.idle_cycles()
+                if idle_cycles > 0:
+                    # sit out the whole idle run, then try again at the next clock
+                    self.valid.value = 0
+                    if idle_cycles > 1:
+                        await cc_triggers.ClockCycles(self.clk, idle_cycles - 1, rising=False)
+                        stall_cycles += idle_cycles - 1
+                    continue
+            if self._packed is not None:
+                self._packed.write(data)
+            else:
+                self.data.value = data
             self.valid.value = 1
             await cc_triggers.ReadOnly()
             if self.ready.value == 1:
                 self.logger.debug(f"Sent {data}")
                 break
 
-        if self.send_queue.empty():
+        if not self.send_queue:
             await cc_triggers.FallingEdge(self.clk)
             self.valid.value = 0
 
+    def _on_falling_edge(self) -> bool:
+        if not self._next_transaction():
+            if self._valid_high:
+                self.valid.value = 0
+                self._valid_high = False
+            return False
+        self._check_stall(self._stall_cycles)
+        self._stall_cycles += 1
+        if self.valid_schedule is not None and not self.valid_schedule.next_cycle():
+            self.valid.value = 0
+            self._valid_high = False
+            return False
+        if self._packed is not None:
+            self._packed.write(self._current)
+        else:
+            self.data.value = self._current
+        self.valid.value = 1
+        self._valid_high = True
+        return True
+
+    def _on_read_only(self) -> None:
+        if self.ready.value == 1:
+            self._stall_cycles = 0
+            self._sent()
+
 
 class StreamMonitor(Monitor):
-    def __init__(self, clk, data, valid, ready, check=True, check_fmt="signed_integer"):
-        super().__init__(clk, check=check)
+    """
+    Check `data` at each valid/ready handshake against the expected transactions.
+
+    stall_limit: fail the test if no handshake happens for `stall_limit` cycles
+        while transactions are still expected, disabled if None.
+    scoreboard: check the received beats in batches, see Scoreboard.
+    """
+
+    def __init__(
+        self,
+        clk,
+        data,
+        valid,
+        ready,
+        check=True,
+        check_fmt="signed_integer",
+        stall_limit: int | None = None,
+        scoreboard: Scoreboard | None = None,
+    ):
+        super().__init__(clk, check=check, stall_limit=stall_limit, scoreboard=scoreboard)
         self.clk = clk
         self.data = data
         self.valid = valid
@@ -50,6 +151,44 @@ class StreamMonitor(Monitor):
 
         assert check_fmt in ["binstr", "integer", "unsigned_integer", "signed_integer"]
         self.check_fmt = check_fmt
+        self._signed = check_fmt == "signed_integer"
+
+        self.ready_schedule = None
+        self._ready_thread = None
+        # the ready value written in this cycle in engine mode
+        self._ready_value = None
+
+        # decode integer array ports to an int64 array in one go
+        self._packed = None
+        if check_fmt != "binstr" and PackedArray.supports(data, signed=self._signed):
+            self._packed = packed_array(data)
+
+    def kill(self):
+        super().kill()
+        if self._ready_thread is not None:
+            self._ready_thread.kill()
+            self._ready_thread = None
+
+    def set_ready_schedule(self, schedule: Schedule | None):
+        """
+        drive ready with the on/off pattern of `schedule`, replacing the previous schedule.
+        None stops driving ready.
+        """
+        if self._ready_thread is not None:
+            self._ready_thread.kill()
+            self._ready_thread = None
+        self.ready_schedule = schedule
+        self._ready_value = None
+        if schedule is not None and not self._engine:
+            self._ready_thread = cocotb.start_soon(schedule_driver(self.ready, self.clk, schedule))
+
+    def _on_falling_edge(self) -> None:
+        # in engine mode ready changes at the falling edge instead of after the rising edge,
+        # so the handshake at the next rising edge sees the value written now rather than the one read back
+        if self._engine and self.ready_schedule is not None:
+            self._ready_value = self.ready_schedule.next_cycle()
+            self.ready.value = self._ready_value
+        super()._on_falling_edge()
 
     def _value_to_check(self, value):
         match self.check_fmt:
@@ -63,15 +202,23 @@ class StreamMonitor(Monitor):
                 raise ValueError(f"Invalid check_fmt: {self.check_fmt}")
 
     def _trigger(self):
+        if self._ready_value is not None:
+            return self.valid.value == 1 and self._ready_value == 1
         return self.valid.value == 1 and self.ready.value == 1
 
+    def _state(self) -> str:
+        return f"{super()._state()}, {_stream_state(self.data, self.valid, self.ready)}"
+
     def _recv(self):
-        if type(self.data.value) == list:
-            return [self._value_to_check(x) for x in self.data.value]
-        elif type(self.data.value) == BinaryValue:
-            return self._value_to_check(self.data.value)
+        if self._packed is not None:
+            return self._packed.read(signed=self._signed)
+        value = self.data.value
+        if type(value) == list:
+            return [self._value_to_check(x) for x in value]
+        elif type(value) == BinaryValue:
+            return self._value_to_check(value)
         else:
-            raise ValueError(f"Data type not supported: {type(self.data.value)}")
+            raise ValueError(f"Data type not supported: {type(value)}")
 
     def _check(self, got, exp):
         if not self.check:
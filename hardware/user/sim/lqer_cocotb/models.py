@@ -0,0 +1,259 @@
+"""
+Bit-exact batched reference models of the int component library, computed with int64 numpy arrays.
+
+Inputs are (batch, words) arrays or anything numpy converts to one, and are read as the bits of input words
+of the given width, e.g. 255 and -1 are the same 8-bit word. Outputs are computed in one vectorised call
+per batch, without per-transaction Python loops. Words and intermediate results wider than
+`MAX_MODEL_WIDTH` bits are computed exactly with Python ints in object arrays, which is slower.
+
+The `*_trace` models give the outputs of the pipelined components cycle by cycle after reset.
+Cycle 0 is the first cycle after the reset edge, and the inputs of cycle t are applied before
+the outputs of cycle t are sampled. Every pipeline register resets to 0 and a sum of reset registers is 0,
+so the outputs are 0 until the inputs of cycle 0 reach them.
+
+overflow: how results are fitted to the output width,
+    - "wrap": keep the low bits, as the RTL does.
+    - "saturate": clamp to the range of the output word.
+"""
+
+import numpy as np
+
+OVERFLOW_MODES = ["wrap", "saturate"]
+# widest word computed in int64, wider words are Python ints in object arrays
+MAX_MODEL_WIDTH = 63
+
+
+def _as_ints(values) -> np.ndarray:
+    """
+    `values` as an array, numpy reads sequences of Python ints beyond int64 as floats, keep them exact instead
+    """
+    array = np.asarray(values)
+    if array.dtype.kind == "f" and not isinstance(values, np.ndarray):
+        return np.asarray(values, dtype=object)
+    return array
+
+
+def wrap(values, width: int, signed: bool) -> np.ndarray:
+    """
+    the low `width` bits of `values`, read as signed or unsigned words
+    """
+    values = _as_ints(values)
+    if width > MAX_MODEL_WIDTH or values.dtype == object:
+        values = np.asarray(values.astype(object) & ((1 << width) - 1), dtype=object)
+        if signed:
+            sign_bit = 1 << (width - 1)
+            values = np.asarray((values ^ sign_bit) - sign_bit, dtype=object)
+        return values if width > MAX_MODEL_WIDTH else values.astype(np.int64)
+    values = values.astype(np.int64) & np.int64((1 << width) - 1)
+    if signed:
+        sign_bit = np.int64(1 << (width - 1))
+        values = (values ^ sign_bit) - sign_bit
+    return values
+
+
+def saturate(values, width: int, signed: bool) -> np.ndarray:
+    """
+    `values` clamped to the range of `width`-bit words
+    """
+    if signed:
+        min_value, max_value = -(1 << (width - 1)), (1 << (width - 1)) - 1
+    else:
+        min_value, max_value = 0, (1 << width) - 1
+    dtype = object if width > MAX_MODEL_WIDTH else np.int64
+    values = _as_ints(values)
+    # uint64 values above the int64 range are compared as Python ints
+    values = values.astype(object if values.dtype in (object, np.uint64) else np.int64)
+    values = np.clip(values, *np.asarray([min_value, max_value], dtype=dtype))
+    return wrap(values, width, signed)
+
+
+def fit(values, width: int, signed: bool, overflow: str = "wrap") -> np.ndarray:
+    match overflow:
+        case "wrap":
+            return wrap(values, width, signed)
+        case "saturate":
+            return saturate(values, width, signed)
+        case _:
+            raise ValueError(f"Invalid overflow: {overflow}, expected one of {OVERFLOW_MODES}")
+
+
+def _widen(values: np.ndarray, width: int) -> np.ndarray:
+    """
+    `values` as Python ints if results of `width` bits overflow int64
+    """
+    return values.astype(object) if width > MAX_MODEL_WIDTH else values
+
+
+def multiply(a, b, a_width: int, b_width: int, out_width: int | None = None, overflow: str = "wrap") -> np.ndarray:
+    """
+    int_multiply: signed product of `a_width`-bit `a` and `b_width`-bit `b`,
+    `out_width` defaults to the full `a_width + b_width` bits
+    """
+    out_width = a_width + b_width if out_width is None else out_width
+    product_width = a_width + b_width
+    a, b = _widen(wrap(a, a_width, True), product_width), _widen(wrap(b, b_width, True), product_width)
+    return fit(a * b, out_width, True, overflow)
+
+
+def entrywise_product(
+    a, b, a_width: int, b_width: int, out_width: int | None = None, overflow: str = "wrap"
+) -> np.ndarray:
+    """
+    int_entrywise_product: entrywise signed products of (batch, words) arrays `a` and `b`
+    """
+    a, b = _as_ints(a), _as_ints(b)
+    assert a.shape == b.shape, f"Shapes of a {a.shape} and b {b.shape} differ"
+    return multiply(a, b, a_width, b_width, out_width, overflow)
+
+
+def adder_tree_node(a, b, in_bits: int, out_bits: int, signed: bool, overflow: str = "wrap") -> np.ndarray:
+    """
+    int_adder_tree_node: sum of the `in_bits`-bit words `a` and `b` extended to `out_bits` bits
+    """
+    a, b = _widen(wrap(a, in_bits, signed), in_bits + 1), _widen(wrap(b, in_bits, signed), in_bits + 1)
+    return fit(a + b, out_bits, signed, overflow)
+
+
+def adder_tree_node_middle(a, b, in_bits: int, out_bits: int, signed: bool) -> tuple[np.ndarray, np.ndarray]:
+    """
+    int_adder_tree_node with REGISTER_MIDDLE: the registered sum of the `out_bits // 2` least significant bits
+    of the extended words, `ls_adder`, and its carry out, `cross_carry`
+    """
+    ls_width = out_bits // 2
+    ls_adder = wrap(wrap(a, in_bits, signed), ls_width, False) + wrap(wrap(b, in_bits, signed), ls_width, False)
+    return ls_adder, ls_adder >> np.int64(ls_width)
+
+
+def _extra_bits(extra_bits_in, batch: int) -> np.ndarray:
+    """
+    the extra bits passed along the pipeline, 0 if not connected
+    """
+    if extra_bits_in is None:
+        return np.zeros(batch, dtype=np.int64)
+    return wrap(np.broadcast_to(extra_bits_in, (batch,)), 1, False)
+
+
+def adder_tree_layer(
+    words_in,
+    in_bits: int,
+    out_bits: int,
+    signed: bool,
+    extra_bits_in=None,
+    overflow: str = "wrap",
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    int_adder_tree_layer: sums of the adjacent pairs of (batch, num_words) `words_in`,
+    the odd last word is added to 0. Returns the (batch, ceil(num_words / 2)) words
+    and the (batch,) extra bits, 0 if `extra_bits_in` is None, i.e. not connected.
+    """
+    words_in = _widen(wrap(np.atleast_2d(_as_ints(words_in)), in_bits, signed), in_bits + 1)
+    num_pairs = words_in.shape[1] // 2
+    sums = words_in[:, 0 : 2 * num_pairs : 2] + words_in[:, 1 : 2 * num_pairs : 2]
+    if words_in.shape[1] % 2:
+        sums = np.concatenate([sums, words_in[:, -1:]], axis=1)
+    return fit(sums, out_bits, signed, overflow), _extra_bits(extra_bits_in, len(words_in))
+
+
+def adder_tree_layer_widths(num_in_words: int, in_bits: int, out_bits: int) -> list[tuple[int, int, int]]:
+    """
+    (num_in_words, in_bits, out_bits) of each layer of int_adder_tree, as generated by the RTL
+    """
+    num_layers = (num_in_words - 1).bit_length()
+    layers = []
+    for i in range(num_layers):
+        num_layer_in_words = (num_in_words + (1 << i) - 1) >> i
+        layer_in_bits = in_bits + i
+        layer_out_bits = out_bits if i == num_layers - 1 else layer_in_bits + 1
+        layers.append((num_layer_in_words, layer_in_bits, layer_out_bits))
+    return layers
+
+
+def adder_tree(
+    words_in,
+    in_bits: int,
+    out_bits: int,
+    signed: bool,
+    extra_bits_in=None,
+    overflow: str = "wrap",
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    int_adder_tree: sum of the (batch, num_words) `words_in` computed layer by layer at the widths of the RTL.
+    Returns the (batch,) sums and the (batch,) extra bits, 0 if `extra_bits_in` is None, i.e. not used.
+    """
+    words = np.atleast_2d(_as_ints(words_in))
+    assert words.shape[1] > 1, "int_adder_tree requires NUM_IN_WORDS > 1"
+    for _, layer_in_bits, layer_out_bits in adder_tree_layer_widths(words.shape[1], in_bits, out_bits):
+        words, _ = adder_tree_layer(words, layer_in_bits, layer_out_bits, signed, overflow=overflow)
+    return words[:, 0], _extra_bits(extra_bits_in, len(words))
+
+
+def delay(values, latency: int, reset_value=0) -> np.ndarray:
+    """
+    the per-cycle trace of (num_cycles, ...) `values` through `latency` registers reset to `reset_value`,
+    i.e. `values[t - latency]` in cycle t and `reset_value` in the first `latency` cycles
+    """
+    assert latency >= 0, f"Invalid latency: {latency}"
+    values = np.asarray(values)
+    trace = np.full_like(values, reset_value)
+    trace[latency:] = values[: max(len(values) - latency, 0)]
+    return trace
+
+
+def adder_tree_node_latency(register_middle: int, register_output: int) -> int:
+    """
+    cycles from the inputs to the output of int_adder_tree_node, int_adder_tree_layer has the same latency
+    """
+    return int(register_middle != 0) + int(register_output != 0)
+
+
+def adder_tree_latency(num_in_words: int, register_middle: int, register_output: int) -> int:
+    """
+    cycles from the inputs to the output of int_adder_tree, one node latency per layer
+    """
+    return (num_in_words - 1).bit_length() * adder_tree_node_latency(register_middle, register_output)
+
+
+def adder_tree_node_trace(
+    a, b, in_bits: int, out_bits: int, signed: bool, register_middle: int = 0, register_output: int = 0
+) -> np.ndarray:
+    """
+    int_adder_tree_node: the (num_cycles,) outputs for the (num_cycles,) inputs `a` and `b`
+    """
+    out = adder_tree_node(a, b, in_bits, out_bits, signed)
+    return delay(out, adder_tree_node_latency(register_middle, register_output))
+
+
+def adder_tree_layer_trace(
+    words_in,
+    in_bits: int,
+    out_bits: int,
+    signed: bool,
+    register_middle: int = 0,
+    register_output: int = 0,
+    extra_bits_in=None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    int_adder_tree_layer: the (num_cycles, ceil(num_words / 2)) words and (num_cycles,) extra bits
+    for the (num_cycles, num_words) `words_in` and (num_cycles,) `extra_bits_in`
+    """
+    words_out, extra_bits_out = adder_tree_layer(words_in, in_bits, out_bits, signed, extra_bits_in)
+    latency = adder_tree_node_latency(register_middle, register_output)
+    return delay(words_out, latency), delay(extra_bits_out, latency)
+
+
+def adder_tree_trace(
+    words_in,
+    in_bits: int,
+    out_bits: int,
+    signed: bool,
+    register_middle: int = 0,
+    register_output: int = 0,
+    extra_bits_in=None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    int_adder_tree: the (num_cycles,) sums and extra bits for the (num_cycles, num_words) `words_in`
+    and (num_cycles,) `extra_bits_in`
+    """
+    sums, extra_bits_out = adder_tree(words_in, in_bits, out_bits, signed, extra_bits_in)
+    latency = adder_tree_latency(np.shape(words_in)[-1], register_middle, register_output)
+    return delay(sums, latency), delay(extra_bits_out, latency)
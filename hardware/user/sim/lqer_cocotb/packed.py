@@ -0,0 +1,162 @@
+from functools import cache
+
+import cocotb
+import numpy as np
+from cocotb.handle import NonHierarchyIndexableObject
+
+from . import wide
+
+# widest element that decodes to int64
+MAX_PACKED_WIDTH = 64
+
+
+def decode_binstr(binstr: str, width: int, signed: bool) -> np.ndarray:
+    """
+    decode the concatenated bit strings of `width`-bit elements, most significant bit first, to an int64 array
+    """
+    assert 0 < width <= MAX_PACKED_WIDTH and (signed or width < MAX_PACKED_WIDTH), f"Unsupported width: {width}"
+    bits = np.frombuffer(binstr.encode("ascii"), dtype=np.uint8) - ord("0")
+    if (bits > 1).any():
+        raise ValueError(f"Unresolvable bit string: {binstr}")
+    assert len(bits) % width == 0, f"Length of the bit string is not a multiple of {width}"
+
+    # left-pad each element to 64 bits and reinterpret the packed bytes as big-endian int64
+    length = len(bits) // width
+    padded = np.zeros((length, 64), dtype=np.uint8)
+    padded[:, 64 - width :] = bits.reshape(length, width)
+    values = np.packbits(padded, axis=1).view(">i8").reshape(length).astype(np.int64)
+
+    if signed and width < 64:
+        sign_bit = np.int64(1) << np.int64(width - 1)
+        values = (values ^ sign_bit) - sign_bit
+    return values
+
+
+def encode_binstr(values: np.ndarray, width: int) -> str:
+    """
+    encode integers as concatenated `width`-bit two's complement bit strings, most significant bit first.
+    The inverse of `decode_binstr`.
+    """
+    assert 0 < width <= MAX_PACKED_WIDTH, f"Unsupported width: {width}"
+    # reinterpret as 64-bit two's complement and unpack the big-endian bytes to bits
+    words = np.asarray(values, dtype=np.int64).astype(">i8")
+    bits = np.unpackbits(words.view(np.uint8).reshape(-1, 8), axis=1)[:, 64 - width :]
+    return (bits + ord("0")).tobytes().decode("ascii")
+
+
+class PackedArray:
+    """
+    Vectorised access to an unpacked array port of integers, e.g. `logic [WIDTH-1:0] data [N]`.
+
+    The element handles are looked up once. Each read fetches the raw bits of all elements
+    as one bit string and decodes them with numpy, instead of building a BinaryValue per element.
+    Elements are ordered left to right as in `signal.value`.
+    """
+
+    def __init__(self, signal: NonHierarchyIndexableObject) -> None:
+        assert isinstance(signal, NonHierarchyIndexableObject), f"{signal._name} is not an unpacked array"
+        self.signal = signal
+        self.elements = [signal[i] for i in signal._range_iter(*signal._range)]
+        self._handles = [element._handle for element in self.elements]
+        self.length = len(self.elements)
+        self.width = len(self.elements[0])
+        assert all(len(e) == self.width for e in self.elements), f"{signal._name} has elements of different widths"
+        # the same value range as assigning an int to a cocotb handle
+        self.min_value = -(2 ** (self.width - 1))
+        self.max_value = 2**self.width - 1
+        if self.width <= 32:
+            self._writers = [(e, e._handle.set_signal_val_int) for e in self.elements]
+        else:
+            self._writers = [(e, e._handle.set_signal_val_binstr) for e in self.elements]
+
+    def __len__(self) -> int:
+        return self.length
+
+    @staticmethod
+    def supports(signal, signed: bool = True) -> bool:
+        """
+        whether `signal` is an unpacked array whose elements fit in int64
+        """
+        if not isinstance(signal, NonHierarchyIndexableObject) or signal._range is None:
+            return False
+        width = len(signal[signal._range[0]])
+        return width <= (MAX_PACKED_WIDTH if signed else MAX_PACKED_WIDTH - 1)
+
+    def read_binstr(self) -> str:
+        return "".join([handle.get_signal_val_binstr() for handle in self._handles])
+
+    def read(self, signed: bool) -> np.ndarray:
+        """
+        the current value of all elements as an int64 array
+        """
+        return decode_binstr(self.read_binstr(), self.width, signed)
+
+    def _range_error(self) -> OverflowError:
+        return OverflowError(f"Value out of range for assignment of {self.width}-bit elements of {self.signal._name}")
+
+    def _as_int64(self, values) -> np.ndarray:
+        """
+        range checked `values` as int64, unsigned 64-bit values above the int64 range keep their bits
+        """
+        if isinstance(values, np.ndarray) and values.dtype == np.uint64:
+            if values.size > 0 and values.max() > self.max_value:
+                raise self._range_error()
+            return values.view(np.int64)
+        try:
+            values = np.asarray(values, dtype=np.int64)
+        except OverflowError:
+            # Python ints beyond int64, only valid for 64-bit elements
+            values = [int(v) for v in values]
+            if min(values) < self.min_value or max(values) > self.max_value:
+                raise self._range_error()
+            return np.array([v & (2**64 - 1) for v in values], dtype=np.uint64).view(np.int64)
+        if values.size > 0 and (values.min() < self.min_value or values.max() > self.max_value):
+            raise self._range_error()
+        return values
+
+    def write(self, values) -> None:
+        """
+        assign a sequence or array of integers to all elements, like `signal.value = list(values)`.
+        The values are range checked and encoded in one step, and the writes are scheduled as by the cocotb handle.
+        """
+        values = self._as_int64(values)
+        assert values.shape == (self.length,), (
+            f"Assigning {values.shape} values to {self.signal._name} of length {self.length}"
+        )
+
+        schedule_write = cocotb.scheduler._schedule_write
+        if self.width <= 32:
+            for (element, set_value), value in zip(self._writers, values.tolist()):
+                schedule_write(element, set_value, 0, value)  # 0: GPI_DEPOSIT
+        else:
+            binstr = encode_binstr(values, self.width)
+            for i, (element, set_value) in enumerate(self._writers):
+                schedule_write(element, set_value, 0, binstr[i * self.width : (i + 1) * self.width])
+
+    def read_limbs(self, signed: bool) -> np.ndarray:
+        """
+        the current value of all elements as uint64 limbs of shape (length, num_limbs(width)), for any width
+        """
+        return wide.decode_binstr(self.read_binstr(), self.width, signed)
+
+    def write_limbs(self, limbs: np.ndarray) -> None:
+        """
+        assign uint64 limbs of shape (length, num_limbs(width)) to all elements, for any width.
+        The bits above the element width are dropped.
+        """
+        limbs = np.asarray(limbs, dtype=np.uint64)
+        assert limbs.shape == (self.length, wide.num_limbs(self.width)), (
+            f"Assigning limbs of shape {limbs.shape} to {self.signal._name} of length {self.length}"
+        )
+        binstr = wide.encode_binstr(limbs, self.width)
+        schedule_write = cocotb.scheduler._schedule_write
+        for i, (element, handle) in enumerate(zip(self.elements, self._handles)):
+            schedule_write(element, handle.set_signal_val_binstr, 0, binstr[i * self.width : (i + 1) * self.width])
+
+
+@cache
+def packed_array(signal: NonHierarchyIndexableObject) -> PackedArray:
+    """
+    the PackedArray of `signal`, created on first use
+    """
+    return PackedArray(signal)
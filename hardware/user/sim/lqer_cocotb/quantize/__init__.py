@@ -1 +1,2 @@
 from .fixed_point import quantize_to_fixed_point
+from .matmul import fixed_point_matmul, matmul_acc_width
@@ -1,6 +1,12 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from .utils import lqer_clamp, lqer_round, lqer_type_as_int
-import numpy as np
-import torch
+
+if TYPE_CHECKING:
+    import numpy as np
+    import torch
 
 
 def quantize_to_fixed_point(
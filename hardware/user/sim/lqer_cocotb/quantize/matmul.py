@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import numpy as np
+
+# widest accumulator of the int64 engine
+MAX_ACC_WIDTH = 63
+# widest accumulator that float64 represents exactly, the matmul then runs on BLAS
+MAX_FLOAT_ACC_WIDTH = 53
+
+
+def matmul_acc_width(a_width: int, b_width: int, n: int) -> int:
+    """
+    width of the accumulator of a (M, N) x (N, K) matmul of signed `a_width`-bit and `b_width`-bit words,
+    wide enough for the sum of `n` products without overflow
+    """
+    return a_width + b_width + (n - 1).bit_length()
+
+
+def _wrap_signed(x: np.ndarray, width: int) -> np.ndarray:
+    """
+    the low `width` bits of `x` as signed words
+    """
+    sign_bit = np.int64(1 << (width - 1))
+    return ((x.astype(np.int64) & np.int64((1 << width) - 1)) ^ sign_bit) - sign_bit
+
+
+def _accumulate(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    int64 products of a (rows, N) and (N, K) words, on BLAS if `b` is float64, which must be exact for the accumulator
+    """
+    if b.dtype == np.float64:
+        return (a.astype(np.float64) @ b).astype(np.int64)
+    return a @ b
+
+
+def _round_shift(acc: np.ndarray, shift: int, rounding: str) -> np.ndarray:
+    """
+    `acc / 2**shift` rounded to an integer like `lqer_round` rounds arrays, computed exactly on integers
+    """
+    q = acc >> np.int64(shift)
+    r = acc & np.int64((1 << shift) - 1)
+    match rounding:
+        case "round" | "nearest":
+            # ties to even, as np.round
+            half = np.int64(1 << (shift - 1))
+            return q + ((r > half) | ((r == half) & ((q & 1) == 1)))
+        case "floor":
+            return q
+        case "ceil":
+            return q + (r != 0)
+        case "trunc":
+            return q + ((r != 0) & (acc < 0))
+        case _:
+            raise ValueError(f"Unsupported rounding method: {rounding}")
+
+
+def _fit_output(acc: np.ndarray, shift: int, out_width: int, rounding: str) -> np.ndarray:
+    """
+    accumulator words shifted right by `shift` fractional bits, rounded and saturated to signed `out_width` bits
+    """
+    max_val = 2 ** (out_width - 1) - 1
+    min_val = -(2 ** (out_width - 1))
+    if shift > 0:
+        return np.clip(_round_shift(acc, shift, rounding), min_val, max_val)
+    # more output fractional bits, saturate before shifting left so that int64 does not overflow
+    shift = -shift
+    out = np.left_shift(np.clip(acc, min_val >> shift, max_val >> shift), shift)
+    out[acc > (max_val >> shift)] = max_val
+    out[acc < -((-min_val) >> shift)] = min_val
+    return out
+
+
+def fixed_point_matmul(
+    a: np.ndarray,
+    b: np.ndarray,
+    a_width: int,
+    a_frac_width: int,
+    b_width: int,
+    b_frac_width: int,
+    out_width: int,
+    out_frac_width: int,
+    round_output: bool = True,
+    rounding: str = "nearest",
+    chunk_size: int = 1 << 20,
+) -> np.ndarray:
+    """
+    Bit-exact reference of simple_matmul: `a @ b` of signed fixed-point words.
+
+    The products are accumulated in full precision, `matmul_acc_width` bits with `a_frac_width + b_frac_width`
+    fractional bits, then rounded to `out_frac_width` fractional bits and saturated to `out_width` bits.
+    The accumulator is computed in int64, and on float64 BLAS when it is at most `MAX_FLOAT_ACC_WIDTH` bits wide,
+    which is exact since every partial sum is an integer below 2**53.
+
+    ---
+    Args:
+
+    a: (..., M, N) integer words of `a_width` bits, read as the bits of signed words.
+    b: (..., N, K) integer words of `b_width` bits, with batch dimensions broadcastable against `a`.
+    round_output: ROUND_OUPTUT, if False the output format must match the accumulator.
+    rounding: the rounding of the dropped fractional bits, one of the `lqer_round` methods,
+
+        - "round" | "nearest": Round to the nearest integer, ties to even.
+        - "floor": Round towards negative infinity, i.e. drop the bits.
+        - "ceil": Round towards positive infinity.
+        - "trunc": Round towards zero.
+
+    chunk_size: the number of accumulator words computed at once, which bounds the temporary memory.
+
+    Returns:
+        (..., M, K) int64 output words of `out_width` bits.
+    """
+    a, b = np.asarray(a), np.asarray(b)
+    assert a.ndim >= 2 and b.ndim >= 2, f"Expected matrices, got a {a.shape} and b {b.shape}"
+    assert a.shape[-1] == b.shape[-2], f"Inner dimensions of a {a.shape} and b {b.shape} differ"
+    assert chunk_size > 0, f"Invalid chunk size: {chunk_size}"
+    m, n, k = a.shape[-2], a.shape[-1], b.shape[-1]
+
+    acc_width = matmul_acc_width(a_width, b_width, n)
+    acc_frac_width = a_frac_width + b_frac_width
+    assert acc_width <= MAX_ACC_WIDTH, f"Accumulator of {acc_width} bits overflows int64"
+    assert 0 < out_width <= 64, f"Unsupported output width for int64 words: {out_width}"
+    if not round_output:
+        assert (out_width, out_frac_width) == (
+            acc_width,
+            acc_frac_width,
+        ), f"Without ROUND_OUPTUT the output format must be the accumulator format ({acc_width}, {acc_frac_width})"
+    exact_float = acc_width <= MAX_FLOAT_ACC_WIDTH
+
+    a, b = _wrap_signed(a, a_width), _wrap_signed(b, b_width)
+    batch_shape = np.broadcast_shapes(a.shape[:-2], b.shape[:-2])
+    if b.ndim == 2:
+        # one shared b, every row of every batch of a is a row of one large matmul
+        a_rows, b_mats = a.reshape(1, -1, n), b.reshape(1, n, k)
+    else:
+        a_rows = np.broadcast_to(a, batch_shape + (m, n)).reshape(-1, m, n)
+        b_mats = np.broadcast_to(b, batch_shape + (n, k)).reshape(-1, n, k)
+
+    out = np.empty(a_rows.shape[:2] + (k,), dtype=np.int64)
+    rows_per_chunk = max(1, chunk_size // max(k, 1))
+    for i in range(len(a_rows)):
+        # converted once per batch, not per chunk of rows
+        b_mat = b_mats[i].astype(np.float64) if exact_float else b_mats[i]
+        for start in range(0, a_rows.shape[1], rows_per_chunk):
+            stop = start + rows_per_chunk
+            acc = _accumulate(a_rows[i, start:stop], b_mat)
+            if round_output:
+                acc = _fit_output(acc, acc_frac_width - out_frac_width, out_width, rounding)
+            out[i, start:stop] = acc
+    return out.reshape(batch_shape + (m, k))
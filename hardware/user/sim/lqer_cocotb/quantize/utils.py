@@ -1,7 +1,15 @@
+from __future__ import annotations
+
 import math
-import torch
+from typing import TYPE_CHECKING
+
 import numpy as np
 
+from ..utils import is_tensor
+
+if TYPE_CHECKING:
+    import torch
+
 
 def lqer_clamp(
     value: int | float | np.ndarray | torch.Tensor,
@@ -23,8 +31,8 @@ def lqer_clamp(
         return max(min(value, max_value), min_value)
     elif isinstance(value, np.ndarray):
         return np.clip(value, min_value, max_value)
-    elif isinstance(value, torch.Tensor):
-        return torch.clamp(value, min_value, max_value)
+    elif is_tensor(value):
+        return value.clamp(min_value, max_value)
     else:
         raise TypeError(f"Unsupported type: {type(value)}")
 
@@ -55,8 +63,8 @@ def lqer_round(
             return int(value + math.copysign(0.5, value))
         elif isinstance(value, np.ndarray):
             return np.round(value)
-        elif isinstance(value, torch.Tensor):
-            return torch.round(value)
+        elif is_tensor(value):
+            return value.round()
         else:
             raise TypeError(f"Unsupported type: {type(value)}")
     elif rounding == "floor":
@@ -64,8 +72,8 @@ def lqer_round(
             return math.floor(value)
         elif isinstance(value, np.ndarray):
             return np.floor(value)
-        elif isinstance(value, torch.Tensor):
-            return torch.floor(value)
+        elif is_tensor(value):
+            return value.floor()
         else:
             raise TypeError(f"Unsupported type: {type(value)}")
     elif rounding == "ceil":
@@ -73,8 +81,8 @@ def lqer_round(
             return math.ceil(value)
         elif isinstance(value, np.ndarray):
             return np.ceil(value)
-        elif isinstance(value, torch.Tensor):
-            return torch.ceil(value)
+        elif is_tensor(value):
+            return value.ceil()
         else:
             raise TypeError(f"Unsupported type: {type(value)}")
     elif rounding == "trunc":
@@ -82,8 +90,8 @@ def lqer_round(
             return math.trunc(value)
         elif isinstance(value, np.ndarray):
             return np.trunc(value)
-        elif isinstance(value, torch.Tensor):
-            return torch.trunc(value)
+        elif is_tensor(value):
+            return value.trunc()
         else:
             raise TypeError(f"Unsupported type: {type(value)}")
     else:
@@ -97,7 +105,7 @@ def lqer_type_as_int(x: int | float | np.ndarray | torch.Tensor):
         return round(x)
     elif isinstance(x, np.ndarray):
         return x.astype(int)
-    elif isinstance(x, torch.Tensor):
+    elif is_tensor(x):
         return x.int()
     else:
         raise TypeError(f"Unsupported type: {type(x)}")
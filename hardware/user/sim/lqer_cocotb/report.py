@@ -0,0 +1,172 @@
+import argparse
+import csv
+import json
+import logging
+import re
+import sys
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConfigReport:
+    """
+    Timing and throughput of one configuration run by lqer_runner.
+
+    `sim_cpu_s` and `peak_rss_mb` are measured on the simulator process,
+    which also hosts the cocotb Python testbench. Linux carries the peak RSS across exec,
+    so `peak_rss_mb` is never smaller than the RSS of the process that launched the simulator.
+    `reason` explains a run that produced no results, e.g. a wall-clock timeout or a simulator crash.
+    `module` is the DUT of the testbench, which tells apart the `test_{i}` of different testbenches.
+    """
+
+    test_id: str
+    module_params: dict[str, int]
+    seed: int
+    module: str = ""
+    num_tests: int = 0
+    num_fails: int = 0
+    build_s: float = 0.0
+    build_cached: bool = False
+    test_s: float = 0.0
+    sim_time_ns: float = 0.0
+    cycles: float = 0.0
+    cycles_per_s: float = 0.0
+    sim_cpu_s: float = 0.0
+    peak_rss_mb: float = 0.0
+    results_xml: str = ""
+    reason: str = ""
+
+
+def read_sim_time_ns(results_xml: Path) -> float:
+    """
+    total simulated time of all testcases in a cocotb results file
+    """
+    tree = ET.parse(results_xml)
+    return sum(float(tc.get("sim_time_ns", 0.0)) for tc in tree.iter("testcase"))
+
+
+def write_report(reports: list[ConfigReport], out_dir: Path) -> tuple[Path, Path]:
+    """
+    write `reports` to `out_dir`/report.json and `out_dir`/report.csv
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    json_path = out_dir / "report.json"
+    csv_path = out_dir / "report.csv"
+
+    with open(json_path, "w") as f:
+        json.dump([asdict(r) for r in reports], f, indent=2)
+
+    columns = [f.name for f in fields(ConfigReport)]
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for r in reports:
+            row = asdict(r)
+            row["module_params"] = json.dumps(row["module_params"], sort_keys=True)
+            writer.writerow(row)
+    return json_path, csv_path
+
+
+def load_report(json_path: Path) -> list[ConfigReport]:
+    with open(json_path, "r") as f:
+        return [ConfigReport(**r) for r in json.load(f)]
+
+
+def report_name(report: ConfigReport) -> str:
+    """
+    `<module>/<test_id>`, unique across the reports of several testbenches
+    """
+    return f"{report.module}/{report.test_id}" if report.module else report.test_id
+
+
+def format_summary_table(reports: list[ConfigReport]) -> str:
+    width = max([12] + [len(report_name(r)) for r in reports])
+    header = (
+        f"{'test':<{width}} {'result':>9} {'build(s)':>9} {'test(s)':>8} {'sim(us)':>10} "
+        f"{'cycles/s':>10} {'cpu(s)':>7} {'rss(MB)':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in reports:
+        result = f"{r.num_tests - r.num_fails}/{r.num_tests}"
+        build = f"{r.build_s:.2f}" + ("*" if r.build_cached else "")
+        lines.append(
+            f"{report_name(r):<{width}} {result:>9} {build:>9} {r.test_s:>8.2f} {r.sim_time_ns / 1e3:>10.1f} "
+            f"{r.cycles_per_s:>10.0f} {r.sim_cpu_s:>7.2f} {r.peak_rss_mb:>8.1f}"
+        )
+    lines.append("-" * len(header))
+    total_build = sum(r.build_s for r in reports)
+    total_test = sum(r.test_s for r in reports)
+    lines.append(
+        f"total build {total_build:.2f} s, total test {total_test:.2f} s (* = build cache hit or shared by seeds)"
+    )
+    return "\n".join(lines)
+
+
+def _report_sort_key(report: ConfigReport) -> list:
+    return [int(x) if x.isdigit() else x for x in re.split(r"(\d+)", report_name(report))]
+
+
+def merge_reports(paths: list[Path], out_dir: Path) -> list[ConfigReport]:
+    """
+    combine the reports and results files of several lqer_runner shards into `out_dir`.
+
+    Each path is either a report.json or a directory searched recursively for report.json files.
+    The results files are expected at `<report dir>/<test_id>/`, as written by lqer_runner,
+    or at the path recorded in the report. Tests are named `<module>/<test_id>` in the merged results.
+    Writes `out_dir`/report.json, `out_dir`/report.csv and a single `out_dir`/results.xml.
+    """
+    report_files = []
+    for path in map(Path, paths):
+        report_files.extend([path] if path.is_file() else sorted(path.rglob("report.json")))
+
+    reports = []
+    testsuites = ET.Element("testsuites", name="results")
+    for report_file in report_files:
+        for r in load_report(report_file):
+            results_xml = report_file.parent / r.test_id / Path(r.results_xml).name
+            if not results_xml.is_file() and r.results_xml:
+                # a report moved away from its test directories, fall back to the recorded path
+                results_xml = Path(r.results_xml)
+            if results_xml.is_file():
+                r.results_xml = results_xml.as_posix()
+                for ts in ET.parse(results_xml).getroot().iter("testsuite"):
+                    ts.set("name", report_name(r))
+                    testsuites.append(ts)
+            else:
+                logger.warning(f"Results file of {report_name(r)} not found: {results_xml}")
+            reports.append(r)
+    reports.sort(key=_report_sort_key)
+
+    out_dir = Path(out_dir)
+    write_report(reports, out_dir)
+    ET.ElementTree(testsuites).write(out_dir / "results.xml", encoding="UTF-8", xml_declaration=True)
+    logger.info(f"Merged {len(reports)} tests from {len(report_files)} reports into {out_dir}")
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m lqer_cocotb.report")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    merge_parser = subparsers.add_parser("merge", help="merge the reports of lqer_runner shards")
+    merge_parser.add_argument("paths", nargs="+", type=Path, help="report.json files or directories to search")
+    merge_parser.add_argument("-o", "--out-dir", type=Path, required=True)
+    args = parser.parse_args()
+
+    match args.command:
+        case "merge":
+            reports = merge_reports(args.paths, args.out_dir)
+            print(format_summary_table(reports))
+            total_tests = sum(r.num_tests for r in reports)
+            total_fails = sum(r.num_fails for r in reports)
+            print(f"PASSED / TOTAL: {total_tests - total_fails} / {total_tests}")
+            print(f"FAILED / TOTAL: {total_fails} / {total_tests}")
+            sys.exit(1 if total_fails > 0 else 0)
+
+
+if __name__ == "__main__":
+    main()
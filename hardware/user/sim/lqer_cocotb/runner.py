@@ -3,11 +3,21 @@ from pathlib import Path
 import shutil
 import re
 import logging
+import operator
 import inspect
-import toml
+import hashlib
+import json
+import os
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from functools import cache
 
-from cocotb.runner import get_runner, get_results
-from .utils import SimTimeScale
+from .build_cache import BuildCache
+from .report import ConfigReport, format_summary_table, read_sim_time_ns, write_report
+from .testbench import CLOCK_PERIOD_NS, SIM_TIME_LIMIT_PLUSARG
 
 logger = logging.getLogger(__name__)
 
@@ -25,18 +35,60 @@ assert (
     LQER_COMPONENT_INCLUDES.exists()
 ), f"Invalid includes directory: {LQER_COMPONENT_INCLUDES}"
 
-with open(LQER_COMPONENT_DEPENDENCY_TOML, "r") as f:
-    LQER_COMPONENT_DEPENDENCY = toml.load(f)
+
+@cache
+def load_dependency_registry() -> dict[str, list[str]]:
+    """
+    parse the dependency registry on first use, since this module is also imported by every simulator process
+    """
+    import toml
+
+    with open(LQER_COMPONENT_DEPENDENCY_TOML, "r") as f:
+        return toml.load(f)
+
+
+def __getattr__(name: str):
+    # LQER_COMPONENT_DEPENDENCY is loaded lazily
+    if name == "LQER_COMPONENT_DEPENDENCY":
+        return load_dependency_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Named build profiles.
+# "debug" builds an unoptimised model with tracing and profiling for interactive debugging,
+# "fast" builds a fully optimised model without tracing for regression sweeps.
+LQER_BUILD_PROFILES = {
+    "debug": {
+        "waves": True,
+        "verilator": [
+            "-prof-c",
+            "--stats",
+            "--trace",
+            # "--trace-fst", # vscode extension does not support fst
+            "--trace-structs",
+            "-O0",
+        ],
+    },
+    "fast": {
+        "waves": False,
+        "verilator": [
+            "-O3",
+            "--x-assign",
+            "fast",
+        ],
+    },
+}
 
 
 def solve_dependency(entry: str) -> list[str]:
     """
     recursively solve the dependency of the entry by looking up LQER_COMPONENT_DEPENDENCY
     """
+    dependency_registry = load_dependency_registry()
 
     def _solve_dependency(entry: str, visited: set[str]) -> list[str]:
         visited.add(entry)
-        dependencies = LQER_COMPONENT_DEPENDENCY[entry]
+        dependencies = dependency_registry[entry]
         for dep in dependencies:
             _solve_dependency(dep, visited)
         return list(visited)
@@ -49,51 +101,39 @@ def solve_dependency(entry: str) -> list[str]:
     return entries
 
 
-def lqer_runner(
-    module_param_list: list[dict[str, int]] = [dict()],
-    extra_build_args: list[str] = [],
-    waves: bool = True,
-    seed: int = 42,
-    simulator: str = "questa",
-):
-    assert isinstance(module_param_list, list)
-
-    testbench_py = Path(inspect.stack()[1].filename).resolve()  # path to <module>_tb.py
-    # print([x.filename for x in inspect.stack()])
-
-    module_name = testbench_py.stem.removesuffix("_tb")
-    dut_sv = (
-        testbench_py.parents[1] / "rtl" / f"{testbench_py.stem.removesuffix('_tb')}.sv"
-    )  # path to <module>.sv
-    assert dut_sv.exists(), f"Failed to find DUT at {dut_sv}"
-    dut_entry = dut_sv.as_posix().removeprefix(LQER_COMPONENT_DIR.as_posix() + "/")
-    sv_sources = solve_dependency(dut_entry)
-    build_dir = testbench_py.parents[0] / "build" / module_name
-
-    if build_dir.exists():
-        shutil.rmtree(build_dir)
-
-    includes = [LQER_COMPONENT_INCLUDES]
-
-    # Set and run the simulator
-
+def _get_simulator_args(
+    simulator: str,
+    module_name: str,
+    profile: str,
+    waves: bool,
+    extra_build_args: list[str],
+    threads: int | None,
+    build_jobs: int | None,
+) -> tuple[list[str], list[str], dict[str, str]]:
+    """
+    return (build_args, test_args, build_env) of the simulator for the build profile
+    """
+    build_env = {}
     match simulator:
         case "verilator":
             build_args = [
                 # Simulation Optimisation
-                "-prof-c",
-                "--stats",
-                "--trace",
-                # "--trace-fst", # vscode extension does not support fst
-                "--trace-structs",
-                "-O0",
+                *LQER_BUILD_PROFILES[profile]["verilator"],
                 # "-Wno-fatal",
                 # "-Wno-lint",
                 # "-Wno-style",
                 # "--timescale-override",
                 # str(default_sim_timescale),  # depends on cocotb version
-                *extra_build_args,
             ]
+            if not waves:
+                # a verilator model built with --trace always dumps waves
+                build_args = [arg for arg in build_args if not arg.startswith("--trace")]
+            if threads is not None:
+                build_args += ["--threads", str(threads)]
+            if build_jobs is not None:
+                build_args += ["-j", str(build_jobs)]
+                build_env["MAKEFLAGS"] = f"-j{build_jobs}"
+            build_args += extra_build_args
             test_args = []
         case "icarus":
             build_args = [
@@ -110,43 +150,538 @@ def lqer_runner(
             test_args = []
         case _:
             raise ValueError(f"Invalid simulator: {simulator}")
+    return build_args, test_args, build_env
 
-    total_tests = 0
-    total_fails = 0
 
-    for i, module_params in enumerate(module_param_list):
-        logger.info("========================================")
-        logger.info(f"Running test {i+1}/{len(module_param_list)}")
-        logger.info("========================================")
+def _wave_file(simulator: str, test_dir: Path) -> Path | None:
+    match simulator:
+        case "verilator":
+            return test_dir / "dump.vcd"
+        case "questa":
+            return test_dir / "vsim.wlf"
+        case _:
+            # the cocotb runner does not record waves for icarus
+            return None
+
+
+def _results_xml_path(test_dir: Path, results_xml: str = "results.xml") -> Path:
+    """
+    path of the results file written by `runner.test`, which prefixes the pytest test name when running under pytest
+    """
+    pytest_current_test = getenv("PYTEST_CURRENT_TEST", "")
+    if pytest_current_test:
+        results_xml = f"{pytest_current_test.split(':')[-1].split(' ')[0]}.{results_xml}"
+    return test_dir / results_xml
+
+
+def _canonical_params(module_params: dict) -> dict:
+    """
+    sort the parameters by name and convert integer-valued parameters to int,
+    so that equal configurations compare equal, e.g. {"B": True, "A": np.int64(8)} -> {"A": 8, "B": 1}
+    """
+    canonical = {}
+    for k in sorted(module_params):
+        v = module_params[k]
+        if isinstance(v, float) and v.is_integer():
+            v = int(v)
+        elif hasattr(v, "__index__"):
+            # bool and numpy integers
+            v = operator.index(v)
+        canonical[k] = v
+    return canonical
+
+
+def _shard_of(module_name: str, module_params: dict[str, int], shard_count: int) -> int:
+    """
+    stable shard assignment of a configuration, independent of its position in `module_param_list`
+    """
+    key = json.dumps([module_name, module_params], sort_keys=True, default=str)
+    return int(hashlib.sha256(key.encode()).hexdigest(), 16) % shard_count
 
-        test_build_dir = build_dir / f"test_{i}"
-        runner = get_runner(simulator)
+
+def _execute_with_rusage(runner, rusages: list, timeout: float | None = None) -> None:
+    """
+    replace `runner._execute` with an equivalent that records the resource usage of each command it runs.
+    A command still running after `timeout` seconds is killed together with its children and raises TimeoutError.
+    """
+
+    def _execute(cmds, cwd) -> None:
+        for cmd in cmds:
+            print(f"INFO: Running command {shlex.join(cmd)} in directory {cwd}")
+            process = subprocess.Popen(cmd, cwd=cwd, env=runner.env, start_new_session=timeout is not None)
+            timed_out = threading.Event()
+
+            def kill_group() -> None:
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+            def kill() -> None:
+                timed_out.set()
+                kill_group()
+
+            timer = threading.Timer(timeout, kill) if timeout is not None else None
+            if timer is not None:
+                timer.start()
+            try:
+                _, status, rusage = os.wait4(process.pid, 0)
+            except BaseException:
+                # in its own session the command does not receive the Ctrl-C of the terminal, do not orphan it
+                if timeout is not None:
+                    kill_group()
+                    process.wait()
+                raise
+            finally:
+                if timer is not None:
+                    timer.cancel()
+            process.returncode = os.waitstatus_to_exitcode(status)
+            rusages.append(rusage)
+            if timed_out.is_set():
+                raise TimeoutError(f"Process {cmd[0]!r} killed after the wall-clock timeout of {timeout} s")
+            if process.returncode != 0:
+                raise SystemExit(
+                    f"Process {cmd[0]!r} terminated with error {process.returncode}"
+                )
+
+    runner._execute = _execute
+
+
+def _link_build_to_test_dir(simulator: str, build_dir: Path, test_dir: Path) -> None:
+    """
+    make the build in `build_dir` visible to a simulation run in another `test_dir`
+    """
+    test_dir.mkdir(parents=True, exist_ok=True)
+    match simulator:
+        case "questa":
+            # vsim looks up the work library "top" relative to its working directory
+            library = test_dir / "top"
+            if not library.exists():
+                library.symlink_to(build_dir / "top", target_is_directory=True)
+        case _:
+            # verilator and icarus run the simulator executable in build_dir by its absolute path
+            pass
+
+
+def _build_config(
+    simulator: str,
+    sv_sources: list[str],
+    includes: list[Path],
+    module_name: str,
+    build_args: list[str],
+    module_params: dict[str, int],
+    build_dir: Path,
+    build_cache: BuildCache | None = None,
+    build_env: dict[str, str] = {},
+) -> tuple[float, bool]:
+    """
+    build one configuration or restore it from `build_cache`, return the build time and whether the cache was hit
+
+    This is a module-level function so that it can be pickled and run in a worker process.
+    """
+    from cocotb.runner import get_runner
+
+    runner = get_runner(simulator)
+    runner.env.update(build_env)
+    _execute_with_rusage(runner, [])
+
+    start = time.perf_counter()
+    cached = False
+    if build_cache is not None:
+        cache_key = build_cache.key(
+            simulator, module_name, sv_sources, includes, module_params, build_args
+        )
+        cached = build_cache.restore(cache_key, build_dir)
+    if not cached:
         runner.build(
             verilog_sources=sv_sources,
             includes=includes,
             hdl_toplevel=module_name,
             build_args=build_args,
             parameters=module_params,
-            build_dir=test_build_dir,
+            build_dir=build_dir,
         )
+        if build_cache is not None:
+            build_cache.store(cache_key, build_dir)
+    return time.perf_counter() - start, cached
+
+
+def _test_config(
+    simulator: str,
+    module_name: str,
+    test_module: str,
+    test_args: list[str],
+    module_params: dict[str, int],
+    build_dir: Path,
+    test_dir: Path,
+    test_id: str,
+    seed: int,
+    waves: bool,
+    timeout: float | None = None,
+    sim_time_limit_ns: float | None = None,
+) -> ConfigReport:
+    """
+    simulate one seed of a configuration built in `build_dir`, return its results and timing.
+    A simulation killed by `timeout` or terminated abnormally counts as one failed test, with the cause in `reason`.
+
+    This is a module-level function so that it can be pickled and run in a worker process.
+    """
+    from cocotb.runner import get_runner, get_results
 
+    report = ConfigReport(test_id=test_id, module_params=module_params, seed=seed, module=module_name)
+    runner = get_runner(simulator)
+    rusages = []
+    _execute_with_rusage(runner, rusages, timeout)
+    if test_dir != build_dir:
+        _link_build_to_test_dir(simulator, build_dir, test_dir)
+    plusargs = []
+    if sim_time_limit_ns is not None:
+        # read by Testbench, which fails the test once the budget is exceeded.
+        # A plusarg rather than extra_env, which cocotb overrides with os.environ
+        plusargs.append(f"+{SIM_TIME_LIMIT_PLUSARG}={sim_time_limit_ns}")
+
+    error = ""
+    start = time.perf_counter()
+    try:
+        # pass the build info explicitly since runner.build runs in another process or is skipped
         results_xml = runner.test(
-            test_module=testbench_py.stem,
+            test_module=test_module,
             hdl_toplevel=module_name,
+            hdl_toplevel_lang="verilog",
+            build_dir=build_dir,
+            test_dir=test_dir,
+            parameters=module_params,
             seed=seed,
-            results_xml=f"results.xml",
+            results_xml="results.xml",
             waves=waves,
             test_args=test_args,
+            plusargs=plusargs,
+        )
+    except TimeoutError as e:
+        error = str(e)
+        results_xml = None
+    except SystemExit as e:
+        # under pytest, runner.test raises as soon as the results file contains a failure.
+        # Collect the results anyway so that all configurations are reported.
+        error = str(e)
+        results_xml = _results_xml_path(test_dir)
+    report.test_s = time.perf_counter() - start
+
+    if results_xml is None or not Path(results_xml).is_file():
+        report.num_tests, report.num_fails = 1, 1
+        report.reason = error or "Simulation terminated abnormally, results file not found"
+    else:
+        report.num_tests, report.num_fails = get_results(results_xml)
+        report.results_xml = Path(results_xml).as_posix()
+        report.sim_time_ns = read_sim_time_ns(results_xml)
+    report.cycles = report.sim_time_ns / CLOCK_PERIOD_NS
+    report.cycles_per_s = report.cycles / report.test_s if report.test_s > 0 else 0.0
+    report.sim_cpu_s = sum(r.ru_utime + r.ru_stime for r in rusages)
+    report.peak_rss_mb = max((r.ru_maxrss for r in rusages), default=0) / 1024
+    return report
+
+
+def lqer_runner(
+    module_param_list: list[dict[str, int]] = [dict()],
+    extra_build_args: list[str] = [],
+    waves: bool | None = None,
+    seed: int = 42,
+    seeds: list[int] | None = None,
+    num_seeds: int | None = None,
+    simulator: str = "questa",
+    max_workers: int | None = None,
+    build_cache: bool | None = None,
+    profile: str | None = None,
+    threads: int | None = None,
+    build_jobs: int | None = None,
+    waves_on_failure: bool | None = None,
+    shard_index: int | None = None,
+    shard_count: int | None = None,
+    timeout: float | None = None,
+    sim_time_limit_ns: float | None = None,
+):
+    """
+    build and simulate the testbench of the caller `<module>_tb.py` for each entry of `module_param_list`.
+    Entries with the same parameters (after sorting and converting integer values to int) are built and run once,
+    under the `test_{i}` id of their first occurrence.
+
+    ---
+    Args:
+
+    waves: record signal traces. Defaults to the setting of the build profile.
+    seeds: the random seeds to simulate each configuration with. Each configuration is built once
+        and simulated with every seed in `test_{i}/seed_{seed}`. Defaults to `num_seeds` consecutive seeds from `seed`.
+    num_seeds: the number of seeds when `seeds` is not given.
+        Defaults to the environment variable `LQER_NUM_SEEDS`, or 1 if not set.
+    profile: the build profile in `LQER_BUILD_PROFILES`, "debug" or "fast".
+        Defaults to the environment variable `LQER_BUILD_PROFILE`, or "debug" if not set.
+    threads: (verilator only) the number of threads of the simulation model, `--threads`.
+    build_jobs: (verilator only) the number of parallel jobs used to compile the model, `-j` and `make -j`.
+    waves_on_failure: run the sweep without waves, then rebuild and rerun only the failing configurations
+        with their failing seeds, the "debug" build profile and waves on.
+        Defaults to the environment variable `LQER_WAVES_ON_FAILURE` (0 or 1), or disabled if not set.
+    max_workers: the number of configurations built and simulated concurrently, each in its own worker process
+        and build directory. Defaults to the environment variable `LQER_MAX_WORKERS`, or 1 (serial) if not set.
+        0 means `os.cpu_count()`.
+    build_cache: reuse compiled simulators from a content-addressed cache in `build/.cache` instead of rebuilding
+        configurations whose sources, parameters, simulator and build args are unchanged.
+        Defaults to the environment variable `LQER_BUILD_CACHE` (0 or 1), or enabled if not set.
+        The cache is limited to `LQER_BUILD_CACHE_MAX_MB` MB (default 4096) with LRU eviction.
+    shard_index, shard_count: run only the configurations assigned to shard `shard_index` out of `shard_count`,
+        split by a stable hash of the module name and parameters. Configurations keep their global `test_{i}` ids,
+        so the per-shard reports can be combined with `python -m lqer_cocotb.report merge`.
+        Default to the environment variables `LQER_SHARD_INDEX` and `LQER_SHARD_COUNT`, or a single shard.
+    timeout: the wall-clock limit in seconds of each simulation run. On expiry the simulator is killed,
+        the run counts as a failed test and the sweep moves on.
+        Defaults to the environment variable `LQER_TIMEOUT_S`, or no limit if not set.
+    sim_time_limit_ns: the simulated time budget in ns of each cocotb test, enforced by `Testbench`.
+        Defaults to the environment variable `LQER_SIM_TIME_LIMIT_NS`, or no limit if not set.
+    """
+    assert isinstance(module_param_list, list)
+
+    testbench_py = Path(inspect.stack()[1].filename).resolve()  # path to <module>_tb.py
+    # print([x.filename for x in inspect.stack()])
+
+    module_name = testbench_py.stem.removesuffix("_tb")
+    dut_sv = (
+        testbench_py.parents[1] / "rtl" / f"{testbench_py.stem.removesuffix('_tb')}.sv"
+    )  # path to <module>.sv
+    assert dut_sv.exists(), f"Failed to find DUT at {dut_sv}"
+    dut_entry = dut_sv.as_posix().removeprefix(LQER_COMPONENT_DIR.as_posix() + "/")
+    sv_sources = solve_dependency(dut_entry)
+    build_dir = testbench_py.parents[0] / "build" / module_name
+
+    if build_dir.exists():
+        shutil.rmtree(build_dir)
+
+    includes = [LQER_COMPONENT_INCLUDES]
+
+    if shard_index is None:
+        shard_index = int(getenv("LQER_SHARD_INDEX", "0"))
+    if shard_count is None:
+        shard_count = int(getenv("LQER_SHARD_COUNT", "1"))
+    assert 0 <= shard_index < shard_count, f"Invalid shard {shard_index} of {shard_count}"
+
+    # deduplicate the configurations, the first occurrence keeps its test_{i} id
+    unique_configs = {}
+    for i, module_params in enumerate(module_param_list):
+        module_params = _canonical_params(module_params)
+        params_key = json.dumps(module_params, default=str)
+        if params_key in unique_configs:
+            logger.debug(f"test_{i} duplicates test_{unique_configs[params_key][0]}, skipped")
+            continue
+        unique_configs[params_key] = (i, module_params)
+    num_duplicates = len(module_param_list) - len(unique_configs)
+
+    # (i, module_params) of the configurations to run on this shard
+    configs = [
+        (i, module_params)
+        for i, module_params in unique_configs.values()
+        if shard_count == 1 or _shard_of(module_name, module_params, shard_count) == shard_index
+    ]
+    if shard_count > 1:
+        logger.info(
+            f"Shard {shard_index}/{shard_count}: running {len(configs)} of {len(unique_configs)} tests"
+        )
+
+    if seeds is None:
+        if num_seeds is None:
+            num_seeds = int(getenv("LQER_NUM_SEEDS", "1"))
+        assert num_seeds > 0, f"Invalid num_seeds: {num_seeds}"
+        seeds = [seed + k for k in range(num_seeds)]
+    seeds = list(dict.fromkeys(seeds))
+    assert len(seeds) > 0, "seeds must not be empty"
+
+    if timeout is None and getenv("LQER_TIMEOUT_S"):
+        timeout = float(getenv("LQER_TIMEOUT_S"))
+    if sim_time_limit_ns is None and getenv("LQER_SIM_TIME_LIMIT_NS"):
+        sim_time_limit_ns = float(getenv("LQER_SIM_TIME_LIMIT_NS"))
+    assert timeout is None or timeout > 0, f"Invalid timeout: {timeout}"
+    assert sim_time_limit_ns is None or sim_time_limit_ns > 0, f"Invalid sim_time_limit_ns: {sim_time_limit_ns}"
+
+    if max_workers is None:
+        max_workers = int(getenv("LQER_MAX_WORKERS", "1"))
+    if max_workers == 0:
+        max_workers = os.cpu_count()
+    assert max_workers > 0, f"Invalid max_workers: {max_workers}"
+    max_workers = min(max_workers, max(len(configs) * len(seeds), 1))
+
+    if build_cache is None:
+        build_cache = bool(int(getenv("LQER_BUILD_CACHE", "1")))
+    cache = None
+    if build_cache:
+        cache = BuildCache(
+            testbench_py.parents[0] / "build" / ".cache",
+            max_size=int(getenv("LQER_BUILD_CACHE_MAX_MB", "4096")) * 1024**2,
+        )
+
+    if profile is None:
+        profile = getenv("LQER_BUILD_PROFILE", "debug")
+    if profile not in LQER_BUILD_PROFILES:
+        raise ValueError(
+            f"Invalid build profile: {profile}, should be one of: {', '.join(LQER_BUILD_PROFILES)}"
         )
-        num_tests, num_fails = get_results(results_xml)
-        total_tests += num_tests
-        total_fails += num_fails
+    if waves_on_failure is None:
+        waves_on_failure = bool(int(getenv("LQER_WAVES_ON_FAILURE", "0")))
+    if waves_on_failure and _wave_file(simulator, build_dir) is None:
+        logger.warning(f"waves_on_failure is not supported by {simulator}, disabled")
+        waves_on_failure = False
+    if waves_on_failure:
+        waves = False
+    elif waves is None:
+        waves = LQER_BUILD_PROFILES[profile]["waves"]
+    logger.info(f"Build profile: {profile}, waves: {waves}")
+
+    # Set and run the simulator
+
+    build_args, test_args, build_env = _get_simulator_args(
+        simulator, module_name, profile, waves, extra_build_args, threads, build_jobs
+    )
+
+    def test_id_of(i: int, seed: int, suffix: str = "") -> str:
+        return f"test_{i}{suffix}/seed_{seed}" if len(seeds) > 1 else f"test_{i}{suffix}"
+
+    def run_configs(
+        jobs: list[tuple[int, dict[str, int], list[int]]], build_args: list[str], waves: bool, suffix: str = ""
+    ) -> list[ConfigReport]:
+        """
+        build each (i, module_params, seeds) of `jobs` once and simulate the build with each of its seeds,
+        return the reports ordered by job and seed
+        """
+
+        def build_kwargs(i: int, module_params: dict[str, int]) -> dict:
+            return dict(
+                simulator=simulator,
+                sv_sources=sv_sources,
+                includes=includes,
+                module_name=module_name,
+                build_args=build_args,
+                module_params=module_params,
+                build_dir=build_dir / f"test_{i}{suffix}",
+                build_cache=cache,
+                build_env=build_env,
+            )
+
+        def test_kwargs(i: int, module_params: dict[str, int], seed: int) -> dict:
+            test_id = test_id_of(i, seed, suffix)
+            return dict(
+                simulator=simulator,
+                module_name=module_name,
+                test_module=testbench_py.stem,
+                test_args=test_args,
+                module_params=module_params,
+                build_dir=build_dir / f"test_{i}{suffix}",
+                test_dir=build_dir / test_id,
+                test_id=test_id,
+                seed=seed,
+                waves=waves,
+                timeout=timeout,
+                sim_time_limit_ns=sim_time_limit_ns,
+            )
+
+        builds = [None] * len(jobs)
+        tests = {}
+        if max_workers <= 1:
+            for j, (i, module_params, job_seeds) in enumerate(jobs):
+                logger.info("========================================")
+                logger.info(f"Running test {j+1}/{len(jobs)}")
+                logger.info("========================================")
+                builds[j] = _build_config(**build_kwargs(i, module_params))
+                for seed in job_seeds:
+                    tests[j, seed] = _test_config(**test_kwargs(i, module_params, seed))
+        else:
+            from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+            logger.info(f"Running {len(jobs)} tests with {max_workers} worker processes")
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                build_futures = {
+                    executor.submit(_build_config, **build_kwargs(i, module_params)): j
+                    for j, (i, module_params, _) in enumerate(jobs)
+                }
+                pending = set(build_futures)
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if future not in build_futures:
+                            continue
+                        # simulate the seeds of a configuration as soon as its build is ready
+                        j = build_futures[future]
+                        builds[j] = future.result()
+                        i, module_params, job_seeds = jobs[j]
+                        for seed in job_seeds:
+                            tests[j, seed] = executor.submit(_test_config, **test_kwargs(i, module_params, seed))
+                            pending.add(tests[j, seed])
+            tests = {k: future.result() for k, future in tests.items()}
+
+        reports = []
+        for j, (_, _, job_seeds) in enumerate(jobs):
+            for k, seed in enumerate(job_seeds):
+                report = tests[j, seed]
+                # the build is shared by all seeds, account for it once
+                report.build_s, report.build_cached = builds[j] if k == 0 else (0.0, True)
+                reports.append(report)
+        return reports
+
+    results = run_configs([(i, module_params, seeds) for i, module_params in configs], build_args, waves)
+
+    wave_files = {}
+    failed_seeds = {}
+    for r in results:
+        if r.num_fails > 0:
+            failed_seeds.setdefault(r.test_id.split("/")[0], []).append(r.seed)
+    if waves_on_failure and len(failed_seeds) > 0:
+        debug_build_args, _, _ = _get_simulator_args(
+            simulator, module_name, "debug", True, extra_build_args, threads, build_jobs
+        )
+        failed_jobs = [
+            (i, module_params, failed_seeds[f"test_{i}"])
+            for i, module_params in configs
+            if f"test_{i}" in failed_seeds
+        ]
+        for i, _, job_seeds in failed_jobs:
+            logger.info(f"Rerunning failed test_{i} with waves, seeds: {job_seeds}")
+        run_configs(failed_jobs, debug_build_args, waves=True, suffix="_waves")
+        for i, _, job_seeds in failed_jobs:
+            for seed in job_seeds:
+                wave_files[test_id_of(i, seed)] = _wave_file(simulator, build_dir / test_id_of(i, seed, "_waves"))
+
+    report_json, report_csv = write_report(results, build_dir)
+    logger.info("Timing Summary")
+    for line in format_summary_table(results).splitlines():
+        logger.info(f"    {line}")
+    logger.info(f"    Report: {report_json}, {report_csv}")
 
     logger.info("Test Summary")
+    total_tests = 0
+    total_fails = 0
+    for r in results:
+        total_tests += r.num_tests
+        total_fails += r.num_fails
+        if r.num_fails > 0:
+            logger.error(f"    {r.test_id} FAILED {r.num_fails} / {r.num_tests}: {r.module_params}")
+            if r.reason:
+                logger.error(f"        reason: {r.reason}")
+            if waves_on_failure:
+                logger.error(f"        waves: {wave_files[r.test_id]}")
+        else:
+            logger.info(f"    {r.test_id} PASSED {r.num_tests} / {r.num_tests}: {r.module_params}")
+
+    if len(seeds) > 1:
+        for seed in seeds:
+            seed_results = [r for r in results if r.seed == seed]
+            seed_tests = sum(r.num_tests for r in seed_results)
+            seed_fails = sum(r.num_fails for r in seed_results)
+            log = logger.error if seed_fails > 0 else logger.info
+            log(f"    seed {seed}: PASSED {seed_tests - seed_fails} / {seed_tests}")
+    if num_duplicates > 0:
+        logger.info(f"    Skipped {num_duplicates} duplicate configurations, {num_duplicates} builds saved")
     logger.info(f"    PASSED / TOTAL: {total_tests - total_fails} / {total_tests}")
     if total_fails > 0:
         logger.error(f"    FAILED / TOTAL: {total_fails} / {total_tests}")
     else:
         logger.info(f"    FAILED / TOTAL: {total_fails} / {total_tests}")
 
+    if total_fails > 0 and getenv("PYTEST_CURRENT_TEST"):
+        raise SystemExit(f"ERROR: Failed {total_fails} of {total_tests} tests.")
+
     return total_fails
@@ -0,0 +1,95 @@
+import numpy as np
+
+from .quantize import quantize_to_fixed_point
+
+DISTRIBUTIONS = ["uniform", "corner", "linspace"]
+# widest word that float64 represents exactly
+MAX_FLOAT_WIDTH = 53
+
+
+def word_range(width: int, signed: bool) -> tuple[int, int]:
+    """
+    the smallest and largest value of a `width`-bit word
+    """
+    assert 0 < width <= (64 if signed else 63), f"Unsupported width for int64 words: {width}, see lqer_cocotb.wide"
+    if signed:
+        return -(2 ** (width - 1)), 2 ** (width - 1) - 1
+    return 0, 2**width - 1
+
+
+def corner_values(width: int, signed: bool) -> np.ndarray:
+    """
+    the values at the ends of the range and around zero
+    """
+    min_value, max_value = word_range(width, signed)
+    values = [min_value, min_value + 1, -1, 0, 1, max_value - 1, max_value]
+    return np.unique([v for v in values if min_value <= v <= max_value]).astype(np.int64)
+
+
+def uniform_words(rng: np.random.Generator, num_beats: int, num_words: int, width: int, signed: bool) -> np.ndarray:
+    min_value, max_value = word_range(width, signed)
+    return rng.integers(min_value, max_value, size=(num_beats, num_words), dtype=np.int64, endpoint=True)
+
+
+def corner_words(
+    rng: np.random.Generator, num_beats: int, num_words: int, width: int, signed: bool, corner_prob: float = 0.25
+) -> np.ndarray:
+    """
+    uniform words, each replaced by a random corner value with probability `corner_prob`
+    """
+    assert 0.0 <= corner_prob <= 1.0, f"Invalid probability: {corner_prob}"
+    words = uniform_words(rng, num_beats, num_words, width, signed)
+    corners = corner_values(width, signed)
+    is_corner = rng.random(words.shape) < corner_prob
+    words[is_corner] = corners[rng.integers(0, len(corners), size=int(is_corner.sum()))]
+    return words
+
+
+def linspace_words(num_beats: int, num_words: int, width: int, signed: bool) -> np.ndarray:
+    """
+    an even sweep over the range of the words, beat after beat, rounded to the nearest integer.
+    A single beat is the same as `np.linspace(min, max, num_words)` quantized with `quantize_to_fixed_point`.
+    """
+    min_value, max_value = word_range(width, signed)
+    num = num_beats * num_words
+    if width <= MAX_FLOAT_WIDTH:
+        words = np.linspace(min_value, max_value, num)
+        words = quantize_to_fixed_point(words, width, frac_width=0, is_signed=signed, rounding="nearest")
+    else:
+        # words beyond the float64 mantissa, with exact integer steps
+        span, steps = max_value - min_value, max(num - 1, 1)
+        words = np.array([min_value + (k * span + steps // 2) // steps for k in range(num)], dtype=np.int64)
+    return words.astype(np.int64).reshape(num_beats, num_words)
+
+
+def generate_words(
+    rng: np.random.Generator,
+    num_beats: int,
+    num_words: int,
+    width: int,
+    signed: bool,
+    dist: str = "uniform",
+    corner_prob: float = 0.25,
+) -> np.ndarray:
+    """
+    a (num_beats, num_words) int64 array of `width`-bit words
+
+    ---
+    Args:
+
+    dist: the distribution of the words, one of
+
+        - "uniform": uniformly random over the range of the words.
+        - "corner": uniformly random with probability 1 - `corner_prob`,
+            otherwise one of the extreme values and the values around zero.
+        - "linspace": an even sweep from the smallest to the largest word, not random.
+    """
+    match dist:
+        case "uniform":
+            return uniform_words(rng, num_beats, num_words, width, signed)
+        case "corner":
+            return corner_words(rng, num_beats, num_words, width, signed, corner_prob)
+        case "linspace":
+            return linspace_words(num_beats, num_words, width, signed)
+        case _:
+            raise ValueError(f"Invalid dist: {dist}, expected one of {DISTRIBUTIONS}")
@@ -1,12 +1,32 @@
+from __future__ import annotations
+
+import random
+from os import getenv
+from typing import TYPE_CHECKING
+
 import cocotb
 from cocotb.triggers import *
 from cocotb.clock import Clock
 from cocotb.log import SimLog
+from cocotb.result import SimTimeoutError
 from cocotb.utils import get_sim_time
 
+from .interface.engine import Engine
+
+if TYPE_CHECKING:
+    import numpy as np
+
+CLOCK_PERIOD_NS = 20
+SIM_TIME_LIMIT_PLUSARG = "lqer_sim_time_limit_ns"
+
 
 class Testbench:
-    def __init__(self, dut, clk=None, rst=None) -> None:
+    """
+    engine: service `input_drivers` and `output_monitors` from a single Engine coroutine
+        instead of a coroutine per interface, requires `clk`
+    """
+
+    def __init__(self, dut, clk=None, rst=None, engine: bool = False) -> None:
         self.dut = dut
         self.clk = clk
         self.rst = rst
@@ -15,11 +35,28 @@ class Testbench:
 
         self.input_drivers = []
         self.output_monitors = []
+        self._rng = None
 
         if self.clk is not None:
-            self.clock = Clock(self.clk, 20, units="ns")
+            self.clock = Clock(self.clk, CLOCK_PERIOD_NS, units="ns")
             cocotb.start_soon(self.clock.start())
 
+        self.engine = None
+        if engine:
+            assert self.clk is not None, "The engine requires a clock"
+            self.engine = Engine(self.clk, self.input_drivers, self.output_monitors)
+            cocotb.start_soon(self.engine.run())
+
+        # simulated time budget of the test, passed by lqer_runner(sim_time_limit_ns=...) as a plusarg,
+        # which the environment of the simulator cannot override
+        sim_time_limit_ns = cocotb.plusargs.get(SIM_TIME_LIMIT_PLUSARG, getenv("LQER_SIM_TIME_LIMIT_NS"))
+        if sim_time_limit_ns:
+            cocotb.start_soon(self._sim_time_watchdog(float(sim_time_limit_ns)))
+
+    async def _sim_time_watchdog(self, limit_ns: float):
+        await Timer(limit_ns, units="ns", round_mode="round")
+        raise SimTimeoutError(f"Exceeded the simulated time budget of {limit_ns} ns")
+
     def assign_self_params(self, *attrs):
         for att in attrs:
             setattr(self, att, getattr(self.dut, att).value)
@@ -36,6 +73,55 @@ class Testbench:
         self.rst.value = 0 if active_high else 1
         await FallingEdge(self.clk)
 
+    async def wait_done(self, timeout: float | None = None, units: str = "ns"):
+        """
+        wait until the drivers in `input_drivers` have sent all their transactions
+        and the monitors in `output_monitors` have checked all their expected transactions,
+        raise SimTimeoutError if it takes longer than `timeout`
+        """
+
+        async def done():
+            for driver in self.input_drivers:
+                await driver.wait_drained()
+            for monitor in self.output_monitors:
+                await monitor.wait_checked()
+
+        if timeout is None:
+            await done()
+        else:
+            await with_timeout(done(), timeout, units)
+
+    @property
+    def rng(self) -> np.random.Generator:
+        """
+        numpy Generator of the test, seeded from `random`, which cocotb seeds with the runner seed
+        """
+        if self._rng is None:
+            import numpy as np
+
+            self._rng = np.random.default_rng(random.getrandbits(64))
+        return self._rng
+
+    def generate_words(
+        self,
+        num_beats: int,
+        num_words: int,
+        width: int,
+        signed: bool | None = None,
+        dist: str = "uniform",
+        corner_prob: float = 0.25,
+    ) -> np.ndarray:
+        """
+        a batch of stimulus as a (num_beats, num_words) int64 array of `width`-bit words,
+        see `lqer_cocotb.stimulus.generate_words` for `dist`.
+        `signed` defaults to the SIGN_EXT parameter if assigned, else True.
+        """
+        from .stimulus import generate_words
+
+        if signed is None:
+            signed = bool(getattr(self, "SIGN_EXT", True))
+        return generate_words(self.rng, num_beats, num_words, width, signed, dist=dist, corner_prob=corner_prob)
+
     def generate_inputs(self, random: bool):
         raise NotImplementedError
 
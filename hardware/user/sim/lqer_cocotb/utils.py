@@ -1,19 +1,50 @@
+from __future__ import annotations
+
 import sys
 from os import PathLike
 from pathlib import Path
 import re
 import logging
+from typing import TYPE_CHECKING
 
-import numpy as np
-import torch
-from torch import Tensor
-from numpy import ndarray
 from cocotb import handle as cc_handle
 
+if TYPE_CHECKING:
+    from numpy import ndarray
+    from torch import Tensor
+
 
 logger = logging.getLogger(__name__)
 
 
+# numpy and torch are imported on first use only.
+# A value cannot be an array/tensor unless its library has been imported already,
+# so these checks never trigger the import themselves.
+def is_ndarray(value) -> bool:
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def is_tensor(value) -> bool:
+    torch = sys.modules.get("torch")
+    return torch is not None and isinstance(value, torch.Tensor)
+
+
+def _check_int_dtype(value) -> bool:
+    """
+    assert `value` is an integer tensor/array, return False if it is neither a tensor nor an array
+    """
+    if is_tensor(value):
+        torch = sys.modules["torch"]
+        assert value.dtype in [torch.int8, torch.int16, torch.int32, torch.int64]
+    elif is_ndarray(value):
+        np = sys.modules["numpy"]
+        assert value.dtype in [np.int8, np.int16, np.int32, np.int64]
+    else:
+        return False
+    return True
+
+
 class SimTimeScale:
     def __init__(
         self,
@@ -66,13 +97,7 @@ class SimTimeScale:
 
 
 def signed_extend(value: int | ndarray | Tensor, bits: int) -> int | ndarray | Tensor:
-    if isinstance(value, Tensor):
-        assert value.dtype in [torch.int8, torch.int16, torch.int32, torch.int64]
-    elif isinstance(value, ndarray):
-        assert value.dtype in [np.int8, np.int16, np.int32, np.int64]
-    elif isinstance(value, int):
-        pass
-    else:
+    if not _check_int_dtype(value) and not isinstance(value, int):
         raise TypeError(f"Unsupported type: {type(value)}")
 
     sign_bit = 1 << (bits - 1)
@@ -81,13 +106,7 @@ def signed_extend(value: int | ndarray | Tensor, bits: int) -> int | ndarray | T
 
 
 def unsigned_extend(value: int | ndarray | Tensor, bits: int) -> int | ndarray | Tensor:
-    if isinstance(value, Tensor):
-        assert value.dtype in [torch.int8, torch.int16, torch.int32, torch.int64]
-    elif isinstance(value, ndarray):
-        assert value.dtype in [np.int8, np.int16, np.int32, np.int64]
-    elif isinstance(value, int):
-        pass
-    else:
+    if not _check_int_dtype(value) and not isinstance(value, int):
         raise TypeError(f"Unsupported type: {type(value)}")
 
     mask = (1 << bits) - 1
@@ -98,12 +117,7 @@ def unsigned_extend(value: int | ndarray | Tensor, bits: int) -> int | ndarray |
 def signed_to_unsigned(
     value: int | ndarray | Tensor, bits: int
 ) -> int | ndarray | Tensor:
-    if isinstance(value, torch.Tensor):
-        assert value.dtype in [torch.int8, torch.int16, torch.int32, torch.int64]
-    elif isinstance(value, np.ndarray):
-        assert value.dtype in [np.int8, np.int16, np.int32, np.int64]
-    elif isinstance(value, int):
-        pass
+    _check_int_dtype(value)
     mask = (1 << bits) - 1
     unsigned = value & mask
     return unsigned
@@ -179,12 +193,56 @@ def signal_binstr(signal):
 
 
 def array1d_uint(signal) -> list[int]:
+    from .packed import PackedArray, packed_array
+
+    if PackedArray.supports(signal, signed=False):
+        return packed_array(signal).read(signed=False).tolist()
     return [x.integer for x in signal.value]
 
 
 def array1d_int(signal) -> list[int]:
+    from .packed import PackedArray, packed_array
+
+    if PackedArray.supports(signal, signed=True):
+        return packed_array(signal).read(signed=True).tolist()
     return [x.signed_integer for x in signal.value]
 
 
 def array1d_binstr(signal) -> list[str]:
     return [x.binstr for x in signal.value]
+
+
+# wide signals as uint64 limbs, see lqer_cocotb.wide
+
+
+def signal_limbs(signal, signed: bool = False) -> ndarray:
+    from . import wide
+
+    signal_value, width = signal.value, len(signal)
+    if isinstance(signal_value, int):
+        limbs = wide.from_ints([signal_value], width)[0]
+        return wide.sign_extend(limbs, width) if signed else limbs
+    elif hasattr(signal_value, "binstr"):
+        return wide.decode_binstr(signal_value.binstr, width, signed)[0]
+    else:
+        raise TypeError(f"Unsupported type: {type(signal)}")
+
+
+def set_signal_limbs(signal, limbs: ndarray) -> None:
+    from cocotb.binary import BinaryValue
+    from . import wide
+
+    width = len(signal)
+    signal.value = BinaryValue(wide.encode_binstr(limbs, width), n_bits=width, bigEndian=False)
+
+
+def array1d_limbs(signal, signed: bool = False) -> ndarray:
+    from .packed import packed_array
+
+    return packed_array(signal).read_limbs(signed)
+
+
+def set_array1d_limbs(signal, limbs: ndarray) -> None:
+    from .packed import packed_array
+
+    packed_array(signal).write_limbs(limbs)
@@ -0,0 +1,118 @@
+"""
+Wide integers as arrays of uint64 limbs.
+
+A batch of `width`-bit words is a uint64 array of shape (..., num_limbs(width)), least significant limb first.
+Bits above `width` are zero for unsigned words and copies of the sign bit for signed words,
+so that a word reads the same as a `64 * num_limbs(width)`-bit two's complement integer.
+"""
+
+import numpy as np
+
+LIMB_WIDTH = 64
+
+
+def num_limbs(width: int) -> int:
+    assert width > 0, f"Invalid width: {width}"
+    return -(-width // LIMB_WIDTH)
+
+
+def _top_limb(width: int) -> tuple[int, np.uint64]:
+    """
+    index of the limb holding bit `width - 1`, and the mask of the bits up to and including it in that limb
+    """
+    index, bit = divmod(width - 1, LIMB_WIDTH)
+    return index, np.uint64((1 << (bit + 1)) - 1)
+
+
+def mask(limbs: np.ndarray, width: int) -> np.ndarray:
+    """
+    clear the bits at and above `width`, i.e. reduce the words modulo 2**width
+    """
+    limbs = np.array(limbs, dtype=np.uint64)
+    index, top_mask = _top_limb(width)
+    limbs[..., index] &= top_mask
+    limbs[..., index + 1 :] = 0
+    return limbs
+
+
+def sign_extend(limbs: np.ndarray, width: int) -> np.ndarray:
+    """
+    copy bit `width - 1` to all bits above it, i.e. interpret the lower `width` bits as two's complement
+    """
+    limbs = mask(limbs, width)
+    index, top_mask = _top_limb(width)
+    negative = (limbs[..., index] >> np.uint64((width - 1) % LIMB_WIDTH)) & np.uint64(1) == 1
+    limbs[..., index] |= np.where(negative, ~top_mask, np.uint64(0))
+    limbs[..., index + 1 :] = np.where(negative[..., None], ~np.uint64(0), np.uint64(0))
+    return limbs
+
+
+def is_negative(limbs: np.ndarray) -> np.ndarray:
+    """
+    the sign of sign-extended words
+    """
+    return limbs[..., -1] >> np.uint64(LIMB_WIDTH - 1) == 1
+
+
+def from_ints(values, width: int) -> np.ndarray:
+    """
+    the limbs of a sequence of Python ints, reduced modulo 2**width
+    """
+    length = num_limbs(width)
+    word_mask = (1 << width) - 1
+    data = b"".join((v & word_mask).to_bytes(length * 8, "little") for v in values)
+    return np.frombuffer(data, dtype="<u8").astype(np.uint64).reshape(-1, length)
+
+
+def to_ints(limbs: np.ndarray, signed: bool = False) -> list[int]:
+    """
+    the Python ints of a batch of words, `signed` for sign-extended words
+    """
+    limbs = np.asarray(limbs, dtype=np.uint64)
+    length = limbs.shape[-1]
+    data = limbs.astype("<u8").reshape(-1, length).tobytes()
+    size = length * 8
+    return [int.from_bytes(data[i : i + size], "little", signed=signed) for i in range(0, len(data), size)]
+
+
+def decode_binstr(binstr: str, width: int, signed: bool = False) -> np.ndarray:
+    """
+    decode the concatenated bit strings of `width`-bit words, most significant bit first, to limbs
+    """
+    bits = np.frombuffer(binstr.encode("ascii"), dtype=np.uint8) - ord("0")
+    if (bits > 1).any():
+        raise ValueError(f"Unresolvable bit string: {binstr}")
+    assert len(bits) % width == 0, f"Length of the bit string is not a multiple of {width}"
+
+    # left-pad each word to whole limbs and reinterpret the packed bytes as big-endian limbs
+    num_words, length = len(bits) // width, num_limbs(width)
+    padded = np.zeros((num_words, length * LIMB_WIDTH), dtype=np.uint8)
+    padded[:, length * LIMB_WIDTH - width :] = bits.reshape(num_words, width)
+    limbs = np.packbits(padded, axis=1).view(">u8")[:, ::-1].astype(np.uint64)
+    return sign_extend(limbs, width) if signed else limbs
+
+
+def encode_binstr(limbs: np.ndarray, width: int) -> str:
+    """
+    encode words as concatenated `width`-bit two's complement bit strings, most significant bit first.
+    The inverse of `decode_binstr`.
+    """
+    limbs = np.asarray(limbs, dtype=np.uint64).reshape(-1, num_limbs(width))
+    words = np.ascontiguousarray(limbs[:, ::-1]).astype(">u8")
+    bits = np.unpackbits(words.view(np.uint8), axis=1)[:, words.shape[1] * LIMB_WIDTH - width :]
+    return (bits + ord("0")).tobytes().decode("ascii")
+
+
+def random_limbs(rng: np.random.Generator, num_words: int, width: int, signed: bool = False) -> np.ndarray:
+    """
+    `num_words` uniformly random `width`-bit words
+    """
+    limbs = rng.integers(0, np.iinfo(np.uint64).max, size=(num_words, num_limbs(width)), dtype=np.uint64, endpoint=True)
+    return sign_extend(limbs, width) if signed else mask(limbs, width)
+
+
+def equal(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    word-wise equality of two batches of words of the same width
+    """
+    return (np.asarray(a) == np.asarray(b)).all(axis=-1)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from lqer_cocotb.interface.beats import BeatQueue
+
+
+def pop_all(queue: BeatQueue) -> list:
+    beats = []
+    while queue:
+        beats.append(queue.popleft())
+    return beats
+
+
+def pytest_fifo_order_across_sources():
+    queue = BeatQueue()
+    queue.append([0, 0])
+    assert queue.extend(np.array([[1, 1], [2, 2]])) == (2, (2, 2))
+    queue.append([3, 3])
+    assert queue.extend([[4, 4], [5, 5]]) == (2, (2,))
+    assert queue.extend(iter([[6, 6], [7, 7], [8, 8]]), window=2) == (None, None)
+    queue.append([9, 9])
+    # the beats not yet pulled from the iterator are not counted
+    assert len(queue) == 7
+    assert pop_all(queue) == [[i, i] for i in range(10)]
+    assert len(queue) == 0 and not queue
+
+
+def pytest_array_beats_are_python_values():
+    queue = BeatQueue()
+    queue.extend(np.arange(6, dtype=np.int64).reshape(3, 2))
+    beat = queue.popleft()
+    assert beat == [0, 1] and all(type(x) is int for x in beat)
+
+
+def pytest_iterator_pulled_on_demand():
+    pulled = []
+
+    def beats():
+        for i in range(10):
+            pulled.append(i)
+            yield [i]
+
+    queue = BeatQueue()
+    queue.extend(beats(), window=3)
+    assert pulled == []
+    assert queue.popleft() == [0]
+    assert pulled == [0, 1, 2]
+    assert pop_all(queue) == [[i] for i in range(1, 10)]
+
+
+def pytest_empty_loads():
+    queue = BeatQueue()
+    assert queue.extend(np.zeros((0, 2))) == (0, (0, 2))
+    assert queue.extend([]) == (0, (0,))
+    queue.extend(iter([]))
+    assert not queue
+    with pytest.raises(IndexError):
+        queue.popleft()
+    with pytest.raises(IndexError):
+        queue.popleft_array(1)
+
+
+def pytest_popleft_array():
+    queue = BeatQueue()
+    queue.extend(np.arange(8).reshape(4, 2))
+    queue.append([8, 9])
+    queue.extend(iter([[10, 11], [12, 13]]))
+    queue.extend(np.arange(14, 20).reshape(3, 2))
+    assert queue.popleft_array(3).tolist() == [[0, 1], [2, 3], [4, 5]]
+    assert queue.popleft_array(5).tolist() == [[6, 7], [8, 9], [10, 11], [12, 13], [14, 15]]
+    assert len(queue) == 2
+    assert queue.popleft() == [16, 17]
+    assert queue.popleft_array(1).tolist() == [[18, 19]]
+    assert not queue
+
+
+def pytest_clear():
+    queue = BeatQueue()
+    queue.extend(np.arange(4).reshape(2, 2))
+    queue.append([0, 0])
+    queue.clear()
+    assert len(queue) == 0 and not queue
@@ -0,0 +1,64 @@
+import os
+
+from lqer_cocotb.build_cache import BuildCache
+
+
+def write_build(build_dir, content: bytes, size: int = 1000):
+    build_dir.mkdir(parents=True, exist_ok=True)
+    (build_dir / "Vtop").write_bytes(content + bytes(size))
+    (build_dir / "obj").mkdir(exist_ok=True)
+    (build_dir / "obj" / "top.o").write_bytes(content)
+    return build_dir
+
+
+def pytest_key(tmp_path):
+    src = tmp_path / "top.sv"
+    src.write_text("module top; endmodule")
+    include = tmp_path / "include"
+    include.mkdir()
+    (include / "defs.svh").write_text("`define WIDTH 8")
+
+    def key(**kwargs):
+        args = dict(
+            simulator="verilator",
+            module_name="top",
+            sv_sources=[str(src)],
+            includes=[include],
+            module_params={"WIDTH": 8, "DEPTH": 4},
+            build_args=["-O3"],
+        )
+        return BuildCache.key(**(args | kwargs))
+
+    base = key()
+    assert key(module_params={"DEPTH": 4, "WIDTH": 8}) == base
+    assert key(module_params={"WIDTH": 16, "DEPTH": 4}) != base
+    assert key(build_args=["-O2"]) != base
+    assert key(simulator="icarus") != base
+    assert key(module_name="other") != base
+    (include / "defs.svh").write_text("`define WIDTH 16")
+    assert key() != base
+    src.write_text("module top; wire a; endmodule")
+    assert key() != key(sv_sources=[])
+
+
+def pytest_store_and_restore(tmp_path):
+    cache = BuildCache(tmp_path / "cache", max_size=1 << 20)
+    assert not cache.restore("k0", tmp_path / "build0")
+    cache.store("k0", write_build(tmp_path / "build", b"first"))
+    # an existing entry is not replaced
+    cache.store("k0", write_build(tmp_path / "other", b"second"))
+
+    assert cache.restore("k0", tmp_path / "build0")
+    assert (tmp_path / "build0" / "obj" / "top.o").read_bytes() == b"first"
+    assert not any(p.name.startswith(".tmp_") for p in (tmp_path / "cache").iterdir())
+
+
+def pytest_evict_least_recently_used(tmp_path):
+    cache = BuildCache(tmp_path / "cache", max_size=2500)
+    for i, key in enumerate(["k0", "k1"]):
+        cache.store(key, write_build(tmp_path / key, key.encode()))
+        os.utime(tmp_path / "cache" / key, (i, i))
+    # restoring k0 makes it the most recently used
+    assert cache.restore("k0", tmp_path / "restored")
+    cache.store("k2", write_build(tmp_path / "k2", b"k2"))
+    assert sorted(p.name for p in (tmp_path / "cache").iterdir()) == ["k0", "k2"]
@@ -0,0 +1,97 @@
+import math
+import random
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from lqer_cocotb.quantize import fixed_point_matmul, matmul_acc_width
+
+ROUNDINGS = {
+    # round() of a Fraction rounds ties to even
+    "nearest": round,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "trunc": math.trunc,
+}
+
+
+def ref_matmul(a, b, a_frac_width, b_frac_width, out_width, out_frac_width, rounding):
+    """
+    `a @ b` of signed fixed-point words as exact fractions, rounded and saturated to `out_width` bits
+    """
+    min_value, max_value = -(1 << (out_width - 1)), (1 << (out_width - 1)) - 1
+    out = []
+    for row in a:
+        out_row = []
+        for col in zip(*b):
+            acc = sum(Fraction(x, 1 << a_frac_width) * Fraction(y, 1 << b_frac_width) for x, y in zip(row, col))
+            out_row.append(min(max(ROUNDINGS[rounding](acc * (1 << out_frac_width)), min_value), max_value))
+        out.append(out_row)
+    return out
+
+
+def random_matrix(rng: random.Random, rows: int, cols: int, width: int) -> list[list[int]]:
+    extremes = [-(1 << (width - 1)), (1 << (width - 1)) - 1]
+    words = [rng.choice(extremes) if rng.random() < 0.2 else rng.randint(*extremes) for _ in range(rows * cols)]
+    return [words[i : i + cols] for i in range(0, rows * cols, cols)]
+
+
+@pytest.mark.parametrize("rounding", ROUNDINGS)
+@pytest.mark.parametrize(
+    "a_width, a_frac_width, b_width, b_frac_width, out_width, out_frac_width",
+    [
+        (8, 4, 8, 4, 8, 4),  # narrower output, float64 accumulator
+        (8, 4, 6, 2, 12, 9),  # more output fractional bits, shift left
+        (30, 10, 28, 20, 16, 8),  # accumulator beyond float64, int64 only
+        (30, 0, 30, 30, 64, 12),  # 63-bit accumulator, 64-bit output
+    ],
+)
+def pytest_matmul_matches_fractions(rounding, a_width, a_frac_width, b_width, b_frac_width, out_width, out_frac_width):
+    rng = random.Random(f"{rounding}{a_width}{b_width}{out_width}")
+    a = random_matrix(rng, 7, 5, a_width)
+    b = random_matrix(rng, 5, 3, b_width)
+    widths = (a_width, a_frac_width, b_width, b_frac_width, out_width, out_frac_width)
+    out = fixed_point_matmul(np.array(a), np.array(b), *widths, rounding=rounding)
+    assert out.dtype == np.int64
+    assert out.tolist() == ref_matmul(a, b, a_frac_width, b_frac_width, out_width, out_frac_width, rounding)
+
+
+def pytest_ties_to_even():
+    # a / 2 with one fractional bit: x.5 rounds to the even neighbour
+    a = np.arange(-7, 8).reshape(-1, 1)
+    b = np.ones((1, 1), dtype=np.int64)
+    out = fixed_point_matmul(a, b, 4, 1, 2, 0, 8, 0, rounding="nearest")
+    assert out.ravel().tolist() == [-4, -3, -2, -2, -2, -1, 0, 0, 0, 1, 2, 2, 2, 3, 4]
+    assert out.ravel().tolist() == [round(Fraction(x, 2)) for x in range(-7, 8)]
+
+
+def pytest_unsigned_bits_read_as_signed():
+    # 0xFF is the bit pattern of -1 in 8 bits
+    out = fixed_point_matmul(np.array([[0xFF, 1]]), np.array([[3], [0xFE]]), 8, 0, 8, 0, 17, 0, round_output=False)
+    assert out.tolist() == [[-3 - 2]]
+
+
+def pytest_batches_and_chunks():
+    rng = random.Random(0)
+    a = [[random_matrix(rng, 6, 4, 8) for _ in range(3)] for _ in range(2)]
+    b = [random_matrix(rng, 4, 5, 8) for _ in range(3)]
+    expected = [[ref_matmul(a_ij, b_j, 4, 4, 10, 3, "nearest") for a_ij, b_j in zip(a_i, b)] for a_i in a]
+    for chunk_size in [1, 7, 1 << 20]:
+        out = fixed_point_matmul(np.array(a), np.array(b), 8, 4, 8, 4, 10, 3, chunk_size=chunk_size)
+        assert out.tolist() == expected
+        # one b shared by every batch
+        out = fixed_point_matmul(np.array(a), np.array(b[0]), 8, 4, 8, 4, 10, 3, chunk_size=chunk_size)
+        assert out.tolist() == [[ref_matmul(a_ij, b[0], 4, 4, 10, 3, "nearest") for a_ij in a_i] for a_i in a]
+
+
+def pytest_accumulator_format():
+    assert matmul_acc_width(8, 8, 1) == 16
+    assert matmul_acc_width(8, 8, 16) == 20
+    assert matmul_acc_width(8, 8, 17) == 21
+    with pytest.raises(AssertionError):
+        fixed_point_matmul(np.zeros((1, 4)), np.zeros((4, 1)), 32, 0, 32, 0, 32, 0)
+    with pytest.raises(AssertionError):
+        fixed_point_matmul(np.zeros((1, 4)), np.zeros((4, 1)), 8, 0, 8, 0, 8, 0, round_output=False)
+    with pytest.raises(ValueError):
+        fixed_point_matmul(np.zeros((1, 4)), np.zeros((4, 1)), 8, 4, 8, 4, 8, 0, rounding="stochastic")
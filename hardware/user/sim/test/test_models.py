@@ -0,0 +1,137 @@
+import random
+
+import numpy as np
+import pytest
+
+from lqer_cocotb.models import (
+    adder_tree,
+    adder_tree_latency,
+    adder_tree_layer,
+    adder_tree_node,
+    adder_tree_node_middle,
+    adder_tree_node_trace,
+    adder_tree_trace,
+    delay,
+    entrywise_product,
+    multiply,
+    saturate,
+    wrap,
+)
+
+# on both sides of the int64 fallback and of 64-bit words
+WIDTHS = [1, 8, 62, 63, 64, 65, 66]
+
+
+def ref_wrap(value: int, width: int, signed: bool) -> int:
+    value &= (1 << width) - 1
+    return value - (1 << width) if signed and value >> (width - 1) else value
+
+
+def ref_saturate(value: int, width: int, signed: bool) -> int:
+    min_value, max_value = (-(1 << (width - 1)), (1 << (width - 1)) - 1) if signed else (0, (1 << width) - 1)
+    return min(max(value, min_value), max_value)
+
+
+def random_words(rng: random.Random, num_words: int, width: int, signed: bool) -> list[int]:
+    """
+    random words with the extreme values mixed in, as Python ints
+    """
+    min_value, max_value = (-(1 << (width - 1)), (1 << (width - 1)) - 1) if signed else (0, (1 << width) - 1)
+    words = [rng.randint(min_value, max_value) for _ in range(num_words)]
+    words[: min(num_words, 2)] = [min_value, max_value][: min(num_words, 2)]
+    return words
+
+
+def as_ints(values) -> list:
+    return np.asarray(values).tolist()
+
+
+@pytest.mark.parametrize("signed", [False, True])
+@pytest.mark.parametrize("width", WIDTHS)
+def pytest_wrap_and_saturate(width, signed):
+    rng = random.Random(width)
+    values = [rng.randint(-(1 << 70), 1 << 70) for _ in range(64)] + [-1, 0, 1, 2**63 - 1, 2**63, 2**64 - 1]
+    assert as_ints(wrap(values, width, signed)) == [ref_wrap(v, width, signed) for v in values]
+    assert as_ints(saturate(values, width, signed)) == [ref_saturate(v, width, signed) for v in values]
+
+
+@pytest.mark.parametrize("signed", [False, True])
+@pytest.mark.parametrize("in_bits", [w for w in WIDTHS if w > 1])
+def pytest_adder_tree_node(in_bits, signed):
+    rng = random.Random(in_bits)
+    a, b = random_words(rng, 64, in_bits, signed), random_words(rng, 64, in_bits, signed)[::-1]
+    for out_bits in [in_bits, in_bits + 1]:
+        exp = [ref_wrap(x + y, out_bits, signed) for x, y in zip(a, b)]
+        assert as_ints(adder_tree_node(a, b, in_bits, out_bits, signed)) == exp
+        assert [int(adder_tree_node(x, y, in_bits, out_bits, signed)) for x, y in zip(a, b)] == exp
+
+        ls_width = out_bits // 2
+        ls_adder, cross_carry = adder_tree_node_middle(a, b, in_bits, out_bits, signed)
+        exp_ls_adder = [ref_wrap(x, ls_width, False) + ref_wrap(y, ls_width, False) for x, y in zip(a, b)]
+        assert as_ints(ls_adder) == exp_ls_adder
+        assert as_ints(cross_carry) == [v >> ls_width for v in exp_ls_adder]
+
+
+@pytest.mark.parametrize("signed", [False, True])
+@pytest.mark.parametrize("in_bits", [w for w in WIDTHS if w > 1])
+def pytest_adder_tree_layer_and_tree(in_bits, signed):
+    rng = random.Random(in_bits)
+    for num_words in [2, 3, 7]:
+        words = [random_words(rng, num_words, in_bits, signed) for _ in range(8)]
+        num_layers = (num_words - 1).bit_length()
+
+        words_out, extra_bits = adder_tree_layer(words, in_bits, in_bits + 1, signed)
+        exp = [[ref_wrap(sum(w[i : i + 2]), in_bits + 1, signed) for i in range(0, num_words, 2)] for w in words]
+        assert as_ints(words_out) == exp
+        assert as_ints(extra_bits) == [0] * len(words)
+
+        sums, _ = adder_tree(words, in_bits, in_bits + num_layers, signed)
+        assert as_ints(sums) == [sum(w) for w in words]
+
+
+def pytest_mixed_sign_words_beyond_int64():
+    # numpy reads lists mixing negative ints and ints >= 2**63 as float64
+    assert as_ints(adder_tree([[-1, 2**63, 3, 4]], 66, 68, True)[0]) == [2**63 + 6]
+    assert as_ints(adder_tree_layer([[-1, 2**63, 3, 4]], 66, 67, True)[0]) == [[2**63 - 1, 7]]
+    assert as_ints(adder_tree([[-1, 2**62, 3, 4]], 63, 65, True)[0]) == [-1 - 2**62 + 7]
+
+
+@pytest.mark.parametrize("a_width, b_width", [(4, 4), (16, 8), (31, 32), (32, 32), (40, 40)])
+def pytest_multiply(a_width, b_width):
+    rng = random.Random(a_width * b_width)
+    a, b = random_words(rng, 64, a_width, True), random_words(rng, 64, b_width, True)[::-1]
+    assert as_ints(multiply(a, b, a_width, b_width)) == [x * y for x, y in zip(a, b)]
+    out_width = a_width + b_width - 4
+    assert as_ints(multiply(a, b, a_width, b_width, out_width, "saturate")) == [
+        ref_saturate(x * y, out_width, True) for x, y in zip(a, b)
+    ]
+    assert as_ints(entrywise_product([a], [b], a_width, b_width)) == [[x * y for x, y in zip(a, b)]]
+
+
+def pytest_invalid_overflow():
+    with pytest.raises(ValueError):
+        multiply(1, 1, 4, 4, overflow="round")
+
+
+def pytest_delay():
+    assert delay([1, 2, 3, 4], 0).tolist() == [1, 2, 3, 4]
+    assert delay([1, 2, 3, 4], 2).tolist() == [0, 0, 1, 2]
+    assert delay([1, 2], 5).tolist() == [0, 0]
+    assert delay([[1, 2], [3, 4]], 1, reset_value=-1).tolist() == [[-1, -1], [1, 2]]
+
+
+@pytest.mark.parametrize("register_middle, register_output", [(0, 0), (1, 0), (0, 1), (1, 1)])
+def pytest_traces(register_middle, register_output):
+    rng = random.Random(2 * register_middle + register_output)
+    words = [random_words(rng, 5, 8, True) for _ in range(20)]
+    latency = adder_tree_latency(5, register_middle, register_output)
+    assert latency == 3 * (register_middle + register_output)
+
+    sums, extra_bits = adder_tree_trace(words, 8, 11, True, register_middle, register_output, [1] * 20)
+    assert sums.tolist() == [0] * latency + [sum(w) for w in words][: 20 - latency]
+    assert extra_bits.tolist() == [0] * latency + [1] * (20 - latency)
+
+    a, b = [w[0] for w in words], [w[1] for w in words]
+    out = adder_tree_node_trace(a, b, 8, 9, True, register_middle, register_output)
+    latency = register_middle + register_output
+    assert out.tolist() == [0] * latency + [x + y for x, y in zip(a, b)][: 20 - latency]
@@ -0,0 +1,81 @@
+import csv
+import json
+from xml.etree import ElementTree as ET
+
+from lqer_cocotb.report import ConfigReport, format_summary_table, load_report, merge_reports, write_report
+
+
+def write_shard(shard_dir, module: str, test_ids: list[str], num_fails: int = 0) -> list[ConfigReport]:
+    """
+    a report.json and results files laid out as lqer_runner writes them
+    """
+    reports = []
+    for test_id in test_ids:
+        results_xml = shard_dir / test_id / "results.xml"
+        results_xml.parent.mkdir(parents=True)
+        testsuites = ET.Element("testsuites")
+        testsuite = ET.SubElement(testsuites, "testsuite", name="results")
+        ET.SubElement(testsuite, "testcase", name="test", sim_time_ns="100")
+        ET.ElementTree(testsuites).write(results_xml)
+        reports.append(
+            ConfigReport(
+                test_id, {"WIDTH": 8}, 0, module=module, num_tests=1, num_fails=num_fails, results_xml=str(results_xml)
+            )
+        )
+    write_report(reports, shard_dir)
+    return reports
+
+
+def pytest_write_and_load(tmp_path):
+    reports = [ConfigReport("test_0", {"WIDTH": 8, "DEPTH": 2}, 3, num_tests=2, cycles=10.0)]
+    json_path, csv_path = write_report(reports, tmp_path)
+    assert load_report(json_path) == reports
+    with open(csv_path, newline="") as f:
+        (row,) = csv.DictReader(f)
+    assert (row["test_id"], row["seed"], row["num_tests"]) == ("test_0", "3", "2")
+    assert json.loads(row["module_params"]) == {"DEPTH": 2, "WIDTH": 8}
+
+
+def pytest_summary_table():
+    reports = [
+        ConfigReport("test_0", {}, 0, num_tests=2, num_fails=1, build_s=1.5, build_cached=True, test_s=2.0),
+        ConfigReport("test_1", {}, 0, num_tests=1, build_s=0.5, test_s=1.0, sim_time_ns=2000.0, cycles_per_s=100.0),
+    ]
+    lines = format_summary_table(reports).splitlines()
+    assert lines[2].split()[:4] == ["test_0", "1/2", "1.50*", "2.00"]
+    assert lines[3].split()[:6] == ["test_1", "1/1", "0.50", "1.00", "2.0", "100"]
+    assert lines[-1].startswith("total build 2.00 s, total test 3.00 s")
+
+
+def pytest_merge_names_tests_by_module(tmp_path):
+    write_shard(tmp_path / "shard0", "fifo", ["test_0", "test_10", "test_2"])
+    write_shard(tmp_path / "shard1", "adder_tree", ["test_0", "test_1"], num_fails=1)
+
+    reports = merge_reports([tmp_path / "shard0", tmp_path / "shard1" / "report.json"], tmp_path / "merged")
+    names = ["adder_tree/test_0", "adder_tree/test_1", "fifo/test_0", "fifo/test_2", "fifo/test_10"]
+    assert [f"{r.module}/{r.test_id}" for r in reports] == names
+    assert [r.module for r in load_report(tmp_path / "merged" / "report.json")] == [n.split("/")[0] for n in names]
+
+    root = ET.parse(tmp_path / "merged" / "results.xml").getroot()
+    assert sorted(ts.get("name") for ts in root.iter("testsuite")) == sorted(names)
+
+    table = format_summary_table(reports)
+    assert all(name in table for name in names)
+    assert "0/1" in table.splitlines()[2]
+
+
+def pytest_merge_moved_report(tmp_path):
+    # a report away from its test directories falls back to the recorded results path
+    write_shard(tmp_path / "shard", "fifo", ["test_0"])
+    moved = tmp_path / "moved" / "report.json"
+    moved.parent.mkdir()
+    (tmp_path / "shard" / "report.json").rename(moved)
+    reports = merge_reports([moved], tmp_path / "merged")
+    assert reports[0].results_xml == (tmp_path / "shard" / "test_0" / "results.xml").as_posix()
+    assert len(list(ET.parse(tmp_path / "merged" / "results.xml").getroot().iter("testcase"))) == 1
+
+
+def pytest_merge_missing_results(tmp_path):
+    reports = [ConfigReport("test_0", {}, 0, module="fifo", reason="simulator crashed")]
+    write_report(reports, tmp_path / "shard")
+    assert merge_reports([tmp_path / "shard"], tmp_path / "merged") == reports
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from lqer_cocotb.interface.schedule import BLOCK_SIZE, Schedule
+
+NUM_CYCLES = 3 * BLOCK_SIZE + 17
+
+
+def schedules():
+    return {
+        "bernoulli": lambda: Schedule.bernoulli(0.3, seed=1),
+        "periodic": lambda: Schedule.periodic(7, 3, phase=2),
+        "burst": lambda: Schedule.burst(5, 9, seed=2),
+        "markov": lambda: Schedule.markov(0.2, 0.5, seed=3),
+    }
+
+
+@pytest.mark.parametrize("name", schedules())
+def pytest_consumers_agree(name):
+    """
+    cycles taken one by one, as runs, as idle gaps or in bulk are the same sequence
+    """
+    make = schedules()[name]
+    expected = make().take(NUM_CYCLES)
+    assert expected.shape == (NUM_CYCLES,) and expected.dtype == bool
+
+    schedule = make()
+    assert [schedule.next_cycle() for _ in range(NUM_CYCLES)] == expected.tolist()
+
+    schedule, runs = make(), []
+    while len(runs) < NUM_CYCLES:
+        value, length = schedule.next_run()
+        assert length > 0
+        runs.extend([value] * length)
+    assert runs[:NUM_CYCLES] == expected.tolist()
+
+    # idle_cycles consumes an off run, or a single on cycle
+    schedule, cycles = make(), []
+    while len(cycles) < NUM_CYCLES:
+        idle = schedule.idle_cycles()
+        cycles.extend([0] * idle if idle else [1])
+    assert cycles[:NUM_CYCLES] == expected.tolist()
+
+    schedule = make()
+    chunks = [schedule.take(n) for n in [0, 1, 5, BLOCK_SIZE, NUM_CYCLES]]
+    assert np.concatenate(chunks)[:NUM_CYCLES].tolist() == expected.tolist()
+
+
+def pytest_periodic():
+    assert Schedule.periodic(4, 1).take(8).tolist() == [1, 0, 0, 0, 1, 0, 0, 0]
+    assert Schedule.periodic(4, 1, phase=2).take(8).tolist() == [0, 0, 1, 0, 0, 0, 1, 0]
+    assert Schedule.periodic(3, 3).take(5).all()
+    assert not Schedule.periodic(3, 0).take(5).any()
+
+
+def pytest_burst_run_lengths():
+    schedule = Schedule.burst(4, 6, seed=0)
+    values, lengths = [], []
+    # whole runs of the first block, runs may be split at the block boundary
+    for _ in range(100):
+        value, length = schedule.next_run()
+        values.append(value)
+        lengths.append(length)
+    assert values == [1, 0] * 50
+    assert all(1 <= n <= 4 for n in lengths[0::2]) and all(1 <= n <= 6 for n in lengths[1::2])
+
+
+def pytest_seeded():
+    assert (Schedule.bernoulli(0.5, seed=7).take(1000) == Schedule.bernoulli(0.5, seed=7).take(1000)).all()
+    assert (Schedule.bernoulli(0.5, seed=7).take(1000) != Schedule.bernoulli(0.5, seed=8).take(1000)).any()
+    assert abs(Schedule.bernoulli(0.25, seed=0).take(20000).mean() - 0.25) < 0.02
+    assert abs(Schedule.markov(0.1, 0.3, seed=0).take(50000).mean() - 0.75) < 0.05
+
+
+def pytest_invalid():
+    with pytest.raises(AssertionError):
+        Schedule.bernoulli(1.5)
+    with pytest.raises(AssertionError):
+        Schedule.periodic(3, 4)
+    with pytest.raises(AssertionError):
+        Schedule.burst(0, 1)
+    with pytest.raises(AssertionError):
+        Schedule.markov(0.0, 0.5)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from lqer_cocotb.interface.scoreboard import Scoreboard
+
+
+def record_all(scoreboard: Scoreboard, beats, first_cycle: int = 0) -> None:
+    for i, beat in enumerate(beats):
+        scoreboard.record(beat, first_cycle + i)
+
+
+def pytest_matching_beats():
+    scoreboard = Scoreboard(chunk_size=4)
+    exp = np.arange(12).reshape(6, 2)
+    record_all(scoreboard, exp[:4].tolist())
+    assert scoreboard.full and len(scoreboard) == 4
+    scoreboard.compare(exp[:4])
+    assert len(scoreboard) == 0 and scoreboard.num_checked == 4
+    record_all(scoreboard, exp[4:].tolist())
+    scoreboard.compare(exp[4:])
+    assert scoreboard.num_checked == 6 and scoreboard.num_mismatches == 0
+    scoreboard.finish()
+
+
+def pytest_first_mismatch_reported():
+    scoreboard = Scoreboard(chunk_size=4)
+    exp = np.arange(8).reshape(8, 1)
+    got = exp.copy()
+    got[5] = -1
+    got[7] = -1
+    record_all(scoreboard, got[:4].tolist(), first_cycle=100)
+    scoreboard.compare(exp[:4])
+    record_all(scoreboard, got[4:].tolist(), first_cycle=104)
+    # counted, not raised, without fail_fast
+    scoreboard.compare(exp[4:])
+    assert scoreboard.num_mismatches == 2
+    with pytest.raises(AssertionError, match="2 of 8 beats mismatched, the first at beat 5, cycle 105"):
+        scoreboard.finish()
+
+
+def pytest_fail_fast():
+    scoreboard = Scoreboard(chunk_size=2, fail_fast=True)
+    record_all(scoreboard, [[1], [2]])
+    with pytest.raises(AssertionError, match="the first at beat 1"):
+        scoreboard.compare(np.array([[1], [3]]))
+
+
+def pytest_shape_mismatch():
+    scoreboard = Scoreboard(chunk_size=2)
+    record_all(scoreboard, [[1, 2], [3, 4]])
+    with pytest.raises(AssertionError, match="shape"):
+        scoreboard.compare(np.array([[1, 2, 0], [3, 4, 0]]))
+
+
+def pytest_python_int_beats():
+    # beats beyond int64 are kept as Python ints
+    scoreboard = Scoreboard(chunk_size=2)
+    beats = [[2**64 - 1, -(2**70)], [0, 2**65]]
+    record_all(scoreboard, beats)
+    scoreboard.compare(np.array(beats, dtype=object))
+    scoreboard.finish()
+    record_all(scoreboard, beats)
+    scoreboard.compare(np.array([[2**64 - 2, -(2**70)], [0, 2**65]], dtype=object))
+    assert scoreboard.num_mismatches == 1
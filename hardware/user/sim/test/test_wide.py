@@ -0,0 +1,66 @@
+import random
+
+import numpy as np
+import pytest
+
+from lqer_cocotb import wide
+
+WIDTHS = [1, 8, 63, 64, 65, 127, 128, 129, 200]
+
+
+def random_ints(rng: random.Random, num_words: int, width: int, signed: bool) -> list[int]:
+    min_value, max_value = (-(1 << (width - 1)), (1 << (width - 1)) - 1) if signed else (0, (1 << width) - 1)
+    return [min_value, max_value, 0] + [rng.randint(min_value, max_value) for _ in range(num_words)]
+
+
+@pytest.mark.parametrize("width", WIDTHS)
+@pytest.mark.parametrize("signed", [False, True])
+def pytest_ints_round_trip(width, signed):
+    values = random_ints(random.Random(width), 20, width, signed)
+    limbs = wide.from_ints(values, width)
+    assert limbs.shape == (len(values), wide.num_limbs(width))
+    if signed:
+        limbs = wide.sign_extend(limbs, width)
+        assert wide.is_negative(limbs).tolist() == [v < 0 for v in values]
+    assert wide.to_ints(limbs, signed) == values
+
+
+@pytest.mark.parametrize("width", WIDTHS)
+def pytest_mask_and_sign_extend(width):
+    rng = random.Random(width)
+    length = wide.num_limbs(width)
+    values = [rng.getrandbits(64 * length) for _ in range(20)]
+    limbs = wide.from_ints(values, 64 * length)
+    assert wide.to_ints(wide.mask(limbs, width)) == [v & ((1 << width) - 1) for v in values]
+    expected = [(v & ((1 << width) - 1)) - ((v >> (width - 1) & 1) << width) for v in values]
+    assert wide.to_ints(wide.sign_extend(limbs, width), signed=True) == expected
+
+
+@pytest.mark.parametrize("width", WIDTHS)
+@pytest.mark.parametrize("signed", [False, True])
+def pytest_binstr_round_trip(width, signed):
+    values = random_ints(random.Random(width), 10, width, signed)
+    binstr = "".join(format(v & ((1 << width) - 1), f"0{width}b") for v in values)
+    limbs = wide.decode_binstr(binstr, width, signed)
+    assert wide.to_ints(limbs, signed) == values
+    assert wide.encode_binstr(limbs, width) == binstr
+
+
+def pytest_decode_unresolvable():
+    with pytest.raises(ValueError):
+        wide.decode_binstr("01x1", 4)
+
+
+@pytest.mark.parametrize("width", WIDTHS)
+@pytest.mark.parametrize("signed", [False, True])
+def pytest_random_limbs(width, signed):
+    limbs = wide.random_limbs(np.random.default_rng(width), 100, width, signed)
+    assert limbs.dtype == np.uint64 and limbs.shape == (100, wide.num_limbs(width))
+    # already masked or sign extended
+    normalize = wide.sign_extend if signed else wide.mask
+    assert wide.equal(limbs, normalize(limbs, width)).all()
+    values = wide.to_ints(limbs, signed)
+    if signed:
+        assert all(-(1 << (width - 1)) <= v < (1 << (width - 1)) for v in values)
+    else:
+        assert all(0 <= v < (1 << width) for v in values)